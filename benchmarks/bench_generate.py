@@ -0,0 +1,207 @@
+"""Benchmark of the generator for the bundled CGMES schemas and all language packages.
+
+Every run is a separate cimgen process writing a profile report (see cimgen/profiling.py), from which the times of
+the phases are taken:
+  - parse:    parsing of the RDF files
+  - merge:    merging of the profiles and computation of the class hierarchy
+  - render:   rendering of the templates
+  - generate: generation of the files of the language (class details, rendering, writing and resolve_headers)
+  - total:    whole generation run
+  - process:  whole cimgen process including the start of python
+
+Usage (from the root of the repository):
+  python benchmarks/bench_generate.py --save benchmarks/baseline.json
+  python benchmarks/bench_generate.py --compare benchmarks/baseline.json
+
+The times depend on the machine, so the baseline is not part of the repository: create it on the machine
+(and on the commit) to compare with.
+"""
+
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_ROOT = ROOT / "cgmes_schema"
+LANGUAGES = ["cpp", "java", "javascript", "python", "modernpython"]
+METRICS = ["parse", "merge", "render", "generate", "total", "process"]
+
+
+def get_schemas() -> dict[str, str]:
+    """Get the bundled schema directories and their CGMES versions.
+
+    :return: Map of schema directory name to CGMES version, e.g. "CGMES_3.0.0" -> "cgmes_v3_0_0".
+    """
+    schemas = {}
+    for directory in sorted(SCHEMA_ROOT.iterdir()):
+        match = re.match(r"CGMES_(\d+)\.(\d+)\.(\d+)", directory.name)
+        if directory.is_dir() and match:
+            schemas[directory.name] = "cgmes_v" + "_".join(match.groups())
+    return schemas
+
+
+def run_once(schema: str, version: str, language: str, output_root: Path, jobs: int) -> dict[str, float]:
+    """Generate the files of one language for one schema in a new cimgen process.
+
+    :param schema:      Name of the schema directory.
+    :param version:     CGMES version, e.g. "cgmes_v3_0_0".
+    :param language:    Language package.
+    :param output_root: Temporary directory for the generated files and the profile report.
+    :param jobs:        Number of worker processes of cimgen.
+    :return:            Times of the phases in seconds.
+    """
+    report_path = output_root / "report.json"
+    command = [
+        sys.executable,
+        "-m",
+        "cimgen.build",
+        f"--outdir={output_root / 'output'}",
+        f"--schemadir={SCHEMA_ROOT / schema}",
+        f"--langdir={language}",
+        f"--cgmes_version={version}",
+        f"--jobs={jobs}",
+        f"--profile-report={report_path}",
+    ]
+    t0 = perf_counter()
+    subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    process_time = perf_counter() - t0
+    with report_path.open(encoding="utf-8") as file:
+        report = json.load(file)
+    phases: dict[str, float] = {}
+    for phase in report["phases"]:
+        phases[phase["name"]] = phases.get(phase["name"], 0.0) + phase["wall_time"]
+    return {
+        "parse": phases.get("parse", 0.0),
+        "merge": phases.get("merge_profiles_and_classes", 0.0) + phases.get("class_hierarchy", 0.0),
+        "render": sum(timing["wall_time"] for timing in report["timings"].get("render", {}).values()),
+        "generate": phases.get("generate", 0.0),
+        "total": report["total"]["wall_time"],
+        "process": process_time,
+    }
+
+
+def get_statistics(values: list[float]) -> dict[str, float]:
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "mean": statistics.mean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+    }
+
+
+def run_benchmarks(schemas: dict[str, str], languages: list[str], repeat: int, warmup: int, jobs: int) -> dict:
+    """Run the benchmarks for all combinations of schemas and languages.
+
+    :param schemas:   Map of schema directory name to CGMES version.
+    :param languages: Language packages.
+    :param repeat:    Number of measured runs per combination.
+    :param warmup:    Number of runs per combination before the measured runs (e.g. to fill the file system cache).
+    :param jobs:      Number of worker processes of cimgen.
+    :return:          Statistics of the phase times per combination "<language>/<schema>".
+    """
+    results = {}
+    for language in languages:
+        for schema, version in schemas.items():
+            runs = []
+            with tempfile.TemporaryDirectory() as temp_dir:
+                for index in range(warmup + repeat):
+                    times = run_once(schema, version, language, Path(temp_dir), jobs)
+                    if index >= warmup:
+                        runs.append(times)
+            key = f"{language}/{schema}"
+            results[key] = {metric: get_statistics([run[metric] for run in runs]) for metric in METRICS}
+            print(f"{key:<40} " + "  ".join(f"{m} {results[key][m]['median']:.3f}s" for m in METRICS), flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float, sigmas: float) -> list[str]:
+    """Compare the results with a baseline.
+
+    The runs vary from run to run, so a metric is only flagged as regression if even the fastest new run is slower
+    than the median of the baseline by more than the noise of the baseline (sigmas times its standard deviation),
+    more than the relative threshold and more than the minimal absolute slowdown.
+
+    :param results:   Results of run_benchmarks.
+    :param baseline:  Results of an earlier run.
+    :param threshold: Relative slowdown flagged as regression, e.g. 0.1 for 10%.
+    :param min_delta: Minimal absolute slowdown in seconds flagged as regression (ignores noise of short phases).
+    :param sigmas:    Number of standard deviations of the baseline treated as noise.
+    :return:          Descriptions of the regressions.
+    """
+    regressions = []
+    for key, metrics in results.items():
+        if key not in baseline:
+            print(f"{key}: not in baseline")
+            continue
+        for metric, stats in metrics.items():
+            old = baseline[key].get(metric)
+            if old is None:
+                continue
+            tolerance = max(min_delta, threshold * old["median"], sigmas * old["stdev"])
+            change = (stats["median"] - old["median"]) / old["median"] if old["median"] else 0.0
+            description = f"{old['median']:.3f}s -> {stats['median']:.3f}s ({change:+.0%}, min {stats['min']:.3f}s)"
+            if stats["min"] - old["median"] > tolerance:
+                regressions.append(f"{key} {metric}: {description}")
+            elif old["median"] - stats["median"] > tolerance:
+                print(f"{key} {metric}: faster {description}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the generator for the bundled CGMES schemas.")
+    parser.add_argument("--languages", nargs="+", choices=LANGUAGES, default=LANGUAGES, help="Language packages")
+    parser.add_argument("--schemas", nargs="+", help="Names of schema directories in cgmes_schema (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measured runs per combination")
+    parser.add_argument("--warmup", type=int, default=1, help="Number of runs per combination before measuring")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes of cimgen")
+    parser.add_argument("--save", type=str, help="Write the results as new baseline to this file")
+    parser.add_argument("--compare", type=str, help="Compare the results with the baseline in this file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown flagged as regression")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="Minimal slowdown in seconds flagged")
+    parser.add_argument(
+        "--sigmas", type=float, default=3.0, help="Standard deviations of the baseline treated as noise"
+    )
+    args = parser.parse_args()
+
+    schemas = get_schemas()
+    if args.schemas:
+        unknown = set(args.schemas) - set(schemas)
+        if unknown:
+            parser.error(f"Unknown schemas: {', '.join(sorted(unknown))}")
+        schemas = {schema: version for schema, version in schemas.items() if schema in args.schemas}
+
+    results = run_benchmarks(schemas, args.languages, args.repeat, args.warmup, args.jobs)
+
+    if args.save:
+        data = {
+            "metadata": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "jobs": args.jobs,
+            },
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+            file.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_delta, args.sigmas)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import time
+
+from cimgen import cimgen, rendering
+
+logger = logging.getLogger(__name__)
+
+CGMES_VERSIONS = ["cgmes_v2_4_13", "cgmes_v2_4_15", "cgmes_v3_0_0"]
+
+
+class BatchJob:
+    """Generation of one schema directory for one or more language packs."""
+
+    def __init__(self, schemadir: str, cgmes_version: str, targets: list[tuple[str, str]]):
+        """Constructor.
+
+        :param schemadir:     The schema directory.
+        :param cgmes_version: CGMES version, e.g. "cgmes_v2_4_15".
+        :param targets:       List of the language pack directories and their output directories.
+        """
+        self.schemadir = schemadir
+        self.cgmes_version = cgmes_version
+        self.targets = targets
+
+    def languages(self) -> str:
+        return ", ".join(langdir for langdir, _ in self.targets)
+
+
+class BatchResult:
+    """Result of a batch job."""
+
+    def __init__(self, job: BatchJob, ok: bool, elapsed: float, error: str = ""):
+        """Constructor.
+
+        :param job:     The batch job.
+        :param ok:      Has the job finished without error?
+        :param elapsed: Elapsed time of the job in seconds.
+        :param error:   Error message if the job has failed.
+        """
+        self.job = job
+        self.ok = ok
+        self.elapsed = elapsed
+        self.error = error
+
+
+def read_manifest(manifest: Path) -> list[BatchJob]:
+    """Read the batch jobs from a JSON manifest.
+
+    The manifest contains a list of jobs with the same keys as the options of the cimgen command, e.g.
+    {"jobs": [{"schemadir": "cgmes_schema/CGMES_3.0.0", "cgmes_version": "cgmes_v3_0_0", "langdir": ["cpp", "java"],
+    "outdir": "output/CGMES_3.0.0"}]}.
+    As with the cimgen command, several language packs of a job are generated into subdirectories of outdir.
+    Relative paths are relative to the current working directory.
+
+    :param manifest: Path of the manifest file.
+    :return:         List of batch jobs.
+    """
+    with manifest.open(encoding="utf-8") as file:
+        content = json.load(file)
+    if not isinstance(content, dict) or not isinstance(content.get("jobs"), list):
+        raise ValueError(f"Manifest '{manifest}' has no list of jobs")
+    jobs = []
+    for index, entry in enumerate(content["jobs"]):
+        try:
+            schemadir = entry["schemadir"]
+            outdir = entry["outdir"]
+            langdirs = entry["langdir"]
+        except KeyError as error:
+            raise ValueError(f"Job {index} of manifest '{manifest}' has no {error}") from error
+        cgmes_version = entry.get("cgmes_version", "cgmes_v2_4_15")
+        if cgmes_version not in CGMES_VERSIONS:
+            raise ValueError(f"Job {index} of manifest '{manifest}' has an unknown cgmes_version '{cgmes_version}'")
+        if isinstance(langdirs, str):
+            langdirs = [langdirs]
+        jobs.append(BatchJob(schemadir, cgmes_version, _get_targets(langdirs, outdir)))
+    return jobs
+
+
+def get_matrix_jobs(schemas: list[str], langdirs: list[str], outdir: str) -> list[BatchJob]:
+    """Create batch jobs for all combinations of schema directories and language packs.
+
+    Each schema directory is parsed once for all language packs,
+    the files are generated into outdir/<lang>/<name of the schema directory>.
+
+    :param schemas:  List of schema directories with CGMES version, e.g. "cgmes_schema/CGMES_3.0.0:cgmes_v3_0_0".
+    :param langdirs: List of language pack directories.
+    :param outdir:   The output directory.
+    :return:         List of batch jobs.
+    """
+    jobs = []
+    for schema in schemas:
+        schemadir, _, cgmes_version = schema.rpartition(":")
+        if not schemadir or cgmes_version not in CGMES_VERSIONS:
+            raise ValueError(f"Schema '{schema}' is not of the form <schemadir>:<cgmes_version>")
+        name = Path(schemadir).name
+        targets = [(langdir, os.path.join(outdir, langdir, name)) for langdir in langdirs]
+        jobs.append(BatchJob(schemadir, cgmes_version, targets))
+    return jobs
+
+
+def _get_targets(langdirs: list[str], outdir: str) -> list[tuple[str, str]]:
+    if len(langdirs) == 1:
+        return [(langdirs[0], outdir)]
+    return [(langdir, os.path.join(outdir, langdir)) for langdir in langdirs]
+
+
+def run_jobs(
+    jobs: list[BatchJob],
+    workers: int = 1,
+    cache_dir: Path | None = None,
+    incremental: bool = False,
+    template_engine: str = "compiled",
+) -> list[BatchResult]:
+    """Run batch jobs, in worker processes if there is more than one worker.
+
+    Each job is run in its own worker process, so the jobs don't share any state of the generator.
+    A failing job does not stop the other jobs.
+
+    :param jobs:            List of batch jobs.
+    :param workers:         Number of worker processes (1: run the jobs one after another in this process).
+    :param cache_dir:       Directory of the cache for the merged classes (None: no cache).
+    :param incremental:     Write only files with changed content and remove only stale files.
+    :param template_engine: Engine used to render the templates, see cimgen.cim_generate.
+    :return:                Results in the order of the jobs.
+    """
+    if workers < 2 or len(jobs) < 2:
+        return [_run_job(job, cache_dir, incremental, template_engine) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), max_tasks_per_child=1) as executor:
+        futures = [executor.submit(_run_job, job, cache_dir, incremental, template_engine) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def _run_job(job: BatchJob, cache_dir: Path | None, incremental: bool, template_engine: str) -> BatchResult:
+    t0 = time()
+    try:
+        targets = [
+            (importlib.import_module(f"cimgen.languages.{langdir}.lang_pack"), outdir)
+            for langdir, outdir in job.targets
+        ]
+        cimgen.cim_generate_languages(
+            Path.cwd() / job.schemadir,
+            targets,
+            job.cgmes_version,
+            cache_dir=cache_dir,
+            incremental=incremental,
+            template_engine=template_engine,
+        )
+    except Exception as error:
+        logger.error(f"Batch job for schema '{job.schemadir}' failed:\n{traceback.format_exc()}")
+        return BatchResult(job, False, time() - t0, f"{type(error).__name__}: {error}")
+    return BatchResult(job, True, time() - t0)
+
+
+def format_summary(results: list[BatchResult], elapsed: float) -> str:
+    """Format the results of the batch jobs as table.
+
+    :param results: Results of the batch jobs.
+    :param elapsed: Elapsed time of the whole batch in seconds.
+    :return:        Summary table.
+    """
+    rows = [("Schema", "Version", "Languages", "Status", "Time [s]")]
+    for result in results:
+        status = "ok" if result.ok else "FAILED: " + result.error
+        rows.append(
+            (result.job.schemadir, result.job.cgmes_version, result.job.languages(), status, f"{result.elapsed:.1f}")
+        )
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]) - 1)]
+    lines = []
+    for row in rows:
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "  " + row[-1].rjust(8))
+    lines.insert(1, "-" * len(lines[0]))
+    failed = sum(not result.ok for result in results)
+    job_time = sum(result.elapsed for result in results)
+    lines.append(f"{len(results)} jobs, {failed} failed, total time {elapsed:.1f}s (sum of job times {job_time:.1f}s)")
+    return "\n".join(lines)
+
+
+def batch() -> None:
+    parser = argparse.ArgumentParser(description="Generate CIM classes for several schemas and languages.")
+    parser.add_argument("--manifest", type=str, help="JSON file with the list of jobs")
+    parser.add_argument(
+        "--schema",
+        type=str,
+        nargs="+",
+        default=[],
+        help="Schema directories with CGMES version, e.g. cgmes_schema/CGMES_3.0.0:cgmes_v3_0_0",
+    )
+    parser.add_argument("--langdir", type=str, nargs="+", default=[], help="The language pack directories")
+    parser.add_argument("--outdir", type=str, help="The output directory of the jobs given by --schema and --langdir")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Number of worker processes running the jobs (0: number of CPUs)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory of the cache for the parsed and merged schema, reused by later runs with the same schema",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Write only files with changed content and remove only stale files from the output directories",
+    )
+    parser.add_argument(
+        "--template-engine",
+        choices=rendering.TEMPLATE_ENGINES,
+        default="compiled",
+        help="Engine used to render the templates, see cimgen --help",
+    )
+    args = parser.parse_args()
+    if bool(args.schema) != bool(args.langdir) or (args.schema and not args.outdir):
+        parser.error("--schema, --langdir and --outdir must be used together")
+    if not args.manifest and not args.schema:
+        parser.error("--manifest or --schema, --langdir and --outdir are required")
+
+    try:
+        jobs = read_manifest(Path(args.manifest)) if args.manifest else []
+        jobs += get_matrix_jobs(args.schema, args.langdir, args.outdir) if args.schema else []
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    workers = args.jobs or os.cpu_count() or 1
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+
+    t0 = time()
+    results = run_jobs(jobs, workers, cache_dir, args.incremental, args.template_engine)
+    print(format_summary(results, time() - t0))
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    batch()
@@ -1,16 +1,32 @@
 import argparse
 import importlib
+import logging
+import os
+import sys
 from pathlib import Path
 from types import ModuleType
 
-from cimgen import cimgen
+from cimgen import cimgen, profiling, rendering, schema_cache, subset
 
 
 def build() -> None:
     parser = argparse.ArgumentParser(description="Generate some CIM classes.")
     parser.add_argument("--outdir", type=str, help="The output directory", required=True)
-    parser.add_argument("--schemadir", type=str, help="The schema directory", required=True)
-    parser.add_argument("--langdir", type=str, help="The language pack directory", required=True)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--schemadir", type=str, help="The schema directory")
+    source.add_argument(
+        "--bundle",
+        type=str,
+        help="Model bundle written with --export-bundle, used instead of the schema directory"
+        + " (the CGMES version is taken from the bundle)",
+    )
+    parser.add_argument(
+        "--langdir",
+        type=str,
+        nargs="+",
+        help="The language pack directory, several language packs are generated into subdirectories of outdir",
+        required=True,
+    )
     parser.add_argument(
         "--cgmes_version",
         type=str,
@@ -18,11 +34,215 @@ def build() -> None:
         default="cgmes_v2_4_15",
         help="CGMES Version",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse the schema files, generate the languages and render the class"
+        + " files (0: number of CPUs)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory of the cache for the parsed and merged schema, reused by later runs with the same schema",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Remove all cached schemas from the cache directory before generating",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Write only files with changed content and remove only stale files from the output directory",
+    )
+    parser.add_argument(
+        "--template-engine",
+        choices=rendering.TEMPLATE_ENGINES,
+        default="compiled",
+        help="Render the templates with python functions compiled from the templates, with chevron,"
+        + " or with both to verify that the results are identical",
+    )
+    parser.add_argument(
+        "--profiles",
+        type=lambda value: [profile.strip() for profile in value.split(",") if profile.strip()],
+        help="Comma separated short names of the profiles to generate, e.g. EQ,SSH,TP,SV"
+        + " (classes of other profiles are only generated if needed by these profiles)",
+    )
+    parser.add_argument(
+        "--root-classes",
+        type=lambda value: [class_name.strip() for class_name in value.split(",") if class_name.strip()],
+        help="Comma separated names of the classes to generate, e.g. ACLineSegment,Terminal"
+        + " (together with their superclasses and the datatypes, enums and primitives of their attributes)",
+    )
+    parser.add_argument(
+        "--follow-associations",
+        action="store_true",
+        help="Generate also the associated classes of the root classes (and their associated classes and so on)",
+    )
+    parser.add_argument(
+        "--pruning-report",
+        type=str,
+        help="Write a JSON report with the kept and the pruned classes of --root-classes to this file",
+    )
+    parser.add_argument(
+        "--export-bundle",
+        type=str,
+        help="Write the merged classes of all profiles to this model bundle (JSON, compressed with gzip for .gz)",
+    )
+    parser.add_argument(
+        "--out-archive",
+        type=str,
+        help="Write the generated files into this zip or tar archive (.zip, .tar, .tar.gz or .tgz) instead of outdir,"
+        + " the paths in the archive are relative to outdir",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Render the files in memory and compare them with outdir (or with --manifest) without writing anything,"
+        + " exit with status 1 and list the differing, missing and stale files if the output is not up to date",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help="Manifest with the content hashes of the generated files: written after the generation,"
+        + " or compared with the rendered files with --check",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate when a schema file or a template of the language packs changes",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between two checks for changed files in watch mode",
+    )
+    parser.add_argument(
+        "--profile-report",
+        type=str,
+        help="Write a JSON report with the time and memory usage of the phases of the generation to this file",
+    )
+    parser.add_argument(
+        "--profile-trace-memory",
+        action="store_true",
+        help="Measure the memory allocated in each phase with tracemalloc for the profile report (slow)",
+    )
     args = parser.parse_args()
+    if args.clear_cache and not args.cache_dir:
+        parser.error("--clear-cache requires --cache-dir")
+    if args.profile_trace_memory and not args.profile_report:
+        parser.error("--profile-trace-memory requires --profile-report")
+    if (args.follow_associations or args.pruning_report) and not args.root_classes:
+        parser.error("--follow-associations and --pruning-report require --root-classes")
+    if args.bundle and (args.cache_dir or args.export_bundle):
+        parser.error("--cache-dir and --export-bundle require --schemadir")
+    if args.out_archive and args.incremental:
+        parser.error("--out-archive can't be used with --incremental")
+    if args.out_archive and not args.out_archive.lower().endswith((".zip", ".tar", ".tar.gz", ".tgz")):
+        parser.error("--out-archive must end with .zip, .tar, .tar.gz or .tgz")
+    if args.check and (args.out_archive or args.incremental):
+        parser.error("--check can't be used with --out-archive or --incremental")
+    if args.watch and (
+        args.bundle or args.check or args.out_archive or args.export_bundle or args.manifest or args.profile_report
+    ):
+        parser.error(
+            "--watch requires --schemadir and can't be used with --check, --out-archive, --export-bundle,"
+            + " --manifest or --profile-report"
+        )
+    if len(set(args.langdir)) != len(args.langdir):
+        parser.error("--langdir contains a language pack more than once")
 
-    lang_pack: ModuleType = importlib.import_module(f"cimgen.languages.{args.langdir}.lang_pack")
-    schema_path = Path.cwd() / args.schemadir
-    cimgen.cim_generate(schema_path, args.outdir, args.cgmes_version, lang_pack)
+    lang_packs: list[ModuleType] = [
+        importlib.import_module(f"cimgen.languages.{langdir}.lang_pack") for langdir in args.langdir
+    ]
+    if len(lang_packs) == 1:
+        targets = [(lang_packs[0], args.outdir)]
+    else:
+        targets = [
+            (lang_pack, os.path.join(args.outdir, langdir)) for lang_pack, langdir in zip(lang_packs, args.langdir)
+        ]
+    jobs = args.jobs or os.cpu_count() or 1
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    if cache_dir and args.clear_cache:
+        schema_cache.clear(cache_dir)
+    pruning_report = Path(args.pruning_report) if args.pruning_report else None
+    out_archive = Path(args.out_archive) if args.out_archive else None
+    manifest = Path(args.manifest) if args.manifest else None
+    if args.watch:
+        # Show the status messages of the watch mode
+        logging.getLogger("cimgen").setLevel(logging.INFO)
+        cimgen.cim_watch(
+            Path.cwd() / args.schemadir,
+            targets,
+            args.cgmes_version,
+            jobs=jobs,
+            template_engine=args.template_engine,
+            profiles=args.profiles,
+            root_classes=args.root_classes,
+            follow_associations=args.follow_associations,
+            interval=args.watch_interval,
+        )
+        return
+    profiler = profiling.Profiler(args.profile_trace_memory) if args.profile_report else None
+    # The profiles and classes of --profiles and --root-classes are only known after reading the schema or bundle
+    try:
+        with profiling.use_profiler(profiler):
+            if args.bundle:
+                differences = cimgen.cim_generate_from_bundle(
+                    Path(args.bundle),
+                    targets,
+                    jobs=jobs,
+                    incremental=args.incremental,
+                    template_engine=args.template_engine,
+                    profiles=args.profiles,
+                    root_classes=args.root_classes,
+                    follow_associations=args.follow_associations,
+                    pruning_report=pruning_report,
+                    out_archive=out_archive,
+                    check=args.check,
+                    manifest=manifest,
+                )
+            else:
+                differences = cimgen.cim_generate_languages(
+                    Path.cwd() / args.schemadir,
+                    targets,
+                    args.cgmes_version,
+                    jobs=jobs,
+                    cache_dir=cache_dir,
+                    incremental=args.incremental,
+                    template_engine=args.template_engine,
+                    profiles=args.profiles,
+                    root_classes=args.root_classes,
+                    follow_associations=args.follow_associations,
+                    pruning_report=pruning_report,
+                    out_archive=out_archive,
+                    check=args.check,
+                    manifest=manifest,
+                    export_bundle=Path(args.export_bundle) if args.export_bundle else None,
+                )
+    except subset.SelectionError as error:
+        parser.error(str(error))
+    if profiler:
+        profiler.write_report(
+            Path(args.profile_report),
+            schemadir=args.schemadir,
+            bundle=args.bundle,
+            cgmes_version=None if args.bundle else args.cgmes_version,
+            languages=args.langdir,
+            jobs=jobs,
+            template_engine=args.template_engine,
+        )
+    if differences and any(differences.values()):
+        for kind, files in differences.items():
+            for file in files:
+                print(f"{kind}: {file}")
+        print(
+            f"Generated output is not up to date: {len(differences['differing'])} differing,"
+            + f" {len(differences['missing'])} missing and {len(differences['stale'])} stale files."
+        )
+        sys.exit(1)
 
 
 if __name__ == "__main__":
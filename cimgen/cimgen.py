@@ -1,162 +1,139 @@
+import importlib
 import logging
+import os
+import pickle
+import re
 import textwrap
 import warnings
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html.entities import html5
+from itertools import repeat
 from pathlib import Path
-from time import time
+from time import perf_counter, sleep, time
 from types import ModuleType
+from xml.parsers import expat
 
-import xmltodict
 from bs4 import BeautifulSoup
 
+from cimgen import model_bundle, output_writer, profiling, rendering, schema_cache, subset
+
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
 class RDFSEntry:
+    """Values of an rdf:Description extracted in one pass over the description.
+
+    All values are strings (empty if the value is missing in the description) except is_used, which is a bool.
+    """
+
+    __slots__ = (
+        "about",
+        "namespace",
+        "is_used",
+        "comment",
+        "datatype",
+        "domain",
+        "is_fixed",
+        "keyword",
+        "inverse_role",
+        "label",
+        "multiplicity",
+        "range",
+        "stereotype",
+        "type",
+        "version_iri",
+        "subclass_of",
+    )
+
     def __init__(self, json_object: dict):
-        self.json_definition = json_object
-        return
+        self.about = ""
+        self.namespace = ""
+        self.is_used = True
+        self.comment = ""
+        self.datatype = ""
+        self.domain = ""
+        self.is_fixed = ""
+        self.keyword = ""
+        self.inverse_role = ""
+        self.label = ""
+        self.multiplicity = ""
+        self.range = ""
+        self.stereotype = ""
+        self.type = ""
+        self.version_iri = ""
+        self.subclass_of = ""
+        for key, value in json_object.items():
+            match key:
+                case "$rdf:about":
+                    about = RDFSEntry._get_about_or_resource(value)
+                    self.about = _get_rid_of_hash(about)
+                    if self.about:
+                        self.namespace = about[: -len(self.about)]
+                case "cims:AssociationUsed":
+                    self.is_used = "yes" == RDFSEntry._extract_string(value).lower()
+                case "rdfs:comment":
+                    self.comment = (
+                        RDFSEntry._extract_text(value)
+                        .replace("–", "-")
+                        .replace("“", '"')
+                        .replace("”", '"')
+                        .replace("’", "'")
+                        .replace("°", "[SYMBOL REMOVED]")
+                        .replace("º", "[SYMBOL REMOVED]")
+                        .replace("\n", " ")
+                    )
+                case "cims:dataType":
+                    self.datatype = RDFSEntry._extract_string(value)
+                case "rdfs:domain":
+                    self.domain = _get_rid_of_hash(RDFSEntry._extract_string(value))
+                case "cims:isFixed":
+                    self.is_fixed = RDFSEntry._extract_text(value)
+                case "dcat:keyword":
+                    self.keyword = value
+                case "cims:inverseRoleName":
+                    self.inverse_role = _get_rid_of_hash(RDFSEntry._extract_string(value))
+                case "rdfs:label":
+                    self.label = RDFSEntry._extract_text(value)
+                case "cims:multiplicity":
+                    self.multiplicity = _get_rid_of_hash(RDFSEntry._extract_string(value))
+                case "rdfs:range":
+                    self.range = RDFSEntry._extract_string(value)
+                case "cims:stereotype":
+                    self.stereotype = RDFSEntry._extract_string(value)
+                case "rdf:type":
+                    self.type = RDFSEntry._extract_string(value)
+                case "owl:versionIRI":
+                    self.version_iri = RDFSEntry._extract_string(value)
+                case "rdfs:subClassOf":
+                    self.subclass_of = _get_rid_of_hash(RDFSEntry._extract_string(value))
 
     def as_json(self) -> dict[str, str]:
         json_object = {}
-        if self.about():
-            json_object["about"] = self.about()
-        if self.namespace():
-            json_object["namespace"] = self.namespace()
-        if self.comment():
-            json_object["comment"] = self.comment()
-        if self.datatype():
-            json_object["datatype"] = self.datatype()
-        if self.domain():
-            json_object["domain"] = self.domain()
-        if self.is_fixed():
-            json_object["is_fixed"] = self.is_fixed()
-        if self.label():
-            json_object["label"] = self.label()
-        if self.multiplicity():
-            json_object["multiplicity"] = self.multiplicity()
-        if self.range():
-            json_object["range"] = self.range()
-        if self.stereotype():
-            json_object["stereotype"] = self.stereotype()
-        if self.type():
-            json_object["type"] = self.type()
-        if self.subclass_of():
-            json_object["subclass_of"] = self.subclass_of()
-        if self.inverse_role():
-            json_object["inverse_role"] = self.inverse_role()
-        json_object["is_used"] = _get_bool_string(self.is_used())
+        for key in (
+            "about",
+            "namespace",
+            "comment",
+            "datatype",
+            "domain",
+            "is_fixed",
+            "label",
+            "multiplicity",
+            "range",
+            "stereotype",
+            "type",
+            "subclass_of",
+            "inverse_role",
+        ):
+            value = getattr(self, key)
+            if value:
+                json_object[key] = value
+        json_object["is_used"] = _get_bool_string(self.is_used)
         return json_object
 
-    def about(self) -> str:
-        if "$rdf:about" in self.json_definition:
-            return _get_rid_of_hash(RDFSEntry._get_about_or_resource(self.json_definition["$rdf:about"]))
-        else:
-            return ""
-
-    def namespace(self) -> str:
-        if "$rdf:about" in self.json_definition:
-            about = RDFSEntry._get_about_or_resource(self.json_definition["$rdf:about"])
-            return about[: -len(self.about())]
-        else:
-            return ""
-
-    # Capitalized True/False is valid in python but not in json.
-    # Do not use this function in combination with json.load()
-    def is_used(self) -> bool:
-        if "cims:AssociationUsed" in self.json_definition:
-            return "yes" == RDFSEntry._extract_string(self.json_definition["cims:AssociationUsed"]).lower()
-        else:
-            return True
-
-    def comment(self) -> str:
-        if "rdfs:comment" in self.json_definition:
-            return (
-                RDFSEntry._extract_text(self.json_definition["rdfs:comment"])
-                .replace("–", "-")
-                .replace("“", '"')
-                .replace("”", '"')
-                .replace("’", "'")
-                .replace("°", "[SYMBOL REMOVED]")
-                .replace("º", "[SYMBOL REMOVED]")
-                .replace("\n", " ")
-            )
-        else:
-            return ""
-
-    def datatype(self) -> str:
-        if "cims:dataType" in self.json_definition:
-            return RDFSEntry._extract_string(self.json_definition["cims:dataType"])
-        else:
-            return ""
-
-    def domain(self) -> str:
-        if "rdfs:domain" in self.json_definition:
-            return _get_rid_of_hash(RDFSEntry._extract_string(self.json_definition["rdfs:domain"]))
-        else:
-            return ""
-
-    def is_fixed(self) -> str:
-        if "cims:isFixed" in self.json_definition:
-            return RDFSEntry._extract_text(self.json_definition["cims:isFixed"])
-        else:
-            return ""
-
-    def keyword(self) -> str:
-        if "dcat:keyword" in self.json_definition:
-            return self.json_definition["dcat:keyword"]
-        else:
-            return ""
-
-    def inverse_role(self) -> str:
-        if "cims:inverseRoleName" in self.json_definition:
-            return _get_rid_of_hash(RDFSEntry._extract_string(self.json_definition["cims:inverseRoleName"]))
-        else:
-            return ""
-
-    def label(self) -> str:
-        if "rdfs:label" in self.json_definition:
-            return RDFSEntry._extract_text(self.json_definition["rdfs:label"])
-        else:
-            return ""
-
-    def multiplicity(self) -> str:
-        if "cims:multiplicity" in self.json_definition:
-            return _get_rid_of_hash(RDFSEntry._extract_string(self.json_definition["cims:multiplicity"]))
-        else:
-            return ""
-
-    def range(self) -> str:
-        if "rdfs:range" in self.json_definition:
-            return RDFSEntry._extract_string(self.json_definition["rdfs:range"])
-        else:
-            return ""
-
-    def stereotype(self) -> str:
-        if "cims:stereotype" in self.json_definition:
-            return RDFSEntry._extract_string(self.json_definition["cims:stereotype"])
-        else:
-            return ""
-
-    def type(self) -> str:
-        if "rdf:type" in self.json_definition:
-            return RDFSEntry._extract_string(self.json_definition["rdf:type"])
-        else:
-            return ""
-
-    def version_iri(self) -> str:
-        if "owl:versionIRI" in self.json_definition:
-            return RDFSEntry._extract_string(self.json_definition["owl:versionIRI"])
-        else:
-            return ""
-
-    def subclass_of(self) -> str:
-        if "rdfs:subClassOf" in self.json_definition:
-            return _get_rid_of_hash(RDFSEntry._extract_string(self.json_definition["rdfs:subClassOf"]))
-        else:
-            return ""
-
-    # Extracts the text out of the dictionary after xmltodict, text is labeled by key '_'
+    # Extracts the text out of the dictionary of a description, text is labeled by key '_'
     @staticmethod
     def _extract_text(object_dic) -> str:
         if isinstance(object_dic, list):
@@ -195,23 +172,34 @@ class RDFSEntry:
 
 class CIMComponentDefinition:
     def __init__(self, rdfs_entry: RDFSEntry):
-        self.about: str = rdfs_entry.about()
+        self.about: str = rdfs_entry.about
         self.attribute_list: list[dict] = []
-        self.comment: str = rdfs_entry.comment()
+        self.attribute_index: dict[str, dict] = {}  # label -> first attribute with this label
+        self.comment: str = rdfs_entry.comment
         self.enum_instance_list: list[dict] = []
+        self.enum_instance_index: dict[str, dict] = {}  # label -> first enum instance with this label
         self.origin_list: list[str] = []
-        self.superclass: str = rdfs_entry.subclass_of()
+        self.superclass: str = rdfs_entry.subclass_of
         self.superclass_list: list[str] = []
         self.subclass_list: list[str] = []
-        self.stereotype: str = rdfs_entry.stereotype()
-        self.namespace: str = rdfs_entry.namespace()
-        _add_to_used_namespaces(self.namespace)
+        self.stereotype: str = rdfs_entry.stereotype
+        self.namespace: str = rdfs_entry.namespace
 
     def attributes(self) -> list[dict]:
         return self.attribute_list
 
     def add_attribute(self, attribute: dict) -> None:
         self.attribute_list.append(attribute)
+        self.attribute_index.setdefault(attribute["label"], attribute)
+
+    def set_attributes(self, attributes: list[dict]) -> None:
+        self.attribute_list = []
+        self.attribute_index = {}
+        for attribute in attributes:
+            self.add_attribute(attribute)
+
+    def attribute(self, label: str) -> dict | None:
+        return self.attribute_index.get(label)
 
     def is_an_enum_class(self) -> bool:
         return len(self.enum_instance_list) > 0
@@ -222,6 +210,10 @@ class CIMComponentDefinition:
     def add_enum_instance(self, instance: dict) -> None:
         instance["index"] = len(self.enum_instance_list)
         self.enum_instance_list.append(instance)
+        self.enum_instance_index.setdefault(instance["label"], instance)
+
+    def enum_instance(self, label: str) -> dict | None:
+        return self.enum_instance_index.get(label)
 
     def origins(self) -> list[str]:
         return self.origin_list
@@ -229,6 +221,9 @@ class CIMComponentDefinition:
     def add_origin(self, origin: str) -> None:
         self.origin_list.append(origin)
 
+    def set_origins(self, origins: list[str]) -> None:
+        self.origin_list = origins
+
     def subclass_of(self) -> str:
         return self.superclass
 
@@ -253,32 +248,346 @@ class CIMComponentDefinition:
     def is_a_datatype_class(self) -> bool:
         return self.stereotype == "CIMDatatype"
 
+    def as_json(self) -> dict:
+        return {
+            "about": self.about,
+            "comment": self.comment,
+            "namespace": self.namespace,
+            "stereotype": self.stereotype,
+            "subclass_of": self.superclass,
+            "superclasses": self.superclass_list,
+            "subclasses": self.subclass_list,
+            "origins": self.origin_list,
+            "attributes": self.attribute_list,
+            "enum_instances": self.enum_instance_list,
+        }
+
+    @staticmethod
+    def from_json(json_object: dict) -> "CIMComponentDefinition":
+        class_infos = CIMComponentDefinition.__new__(CIMComponentDefinition)
+        class_infos.about = json_object["about"]
+        class_infos.comment = json_object["comment"]
+        class_infos.namespace = json_object["namespace"]
+        class_infos.stereotype = json_object["stereotype"]
+        class_infos.superclass = json_object["subclass_of"]
+        class_infos.superclass_list = json_object["superclasses"]
+        class_infos.subclass_list = json_object["subclasses"]
+        class_infos.origin_list = json_object["origins"]
+        class_infos.set_attributes(json_object["attributes"])
+        class_infos.enum_instance_list = json_object["enum_instances"]
+        class_infos.enum_instance_index = {}
+        for instance in class_infos.enum_instance_list:
+            class_infos.enum_instance_index.setdefault(instance["label"], instance)
+        return class_infos
+
+
+class ClassHierarchy:
+    """Index of the class hierarchy: ancestors, descendants and inherited attributes of each class.
+
+    The superclass chains are computed once in topological order, i.e. the ancestor list of a class is built from the
+    already computed ancestor list of its superclass. Inheritance cycles are detected (ValueError).
+    """
 
+    def __init__(self, class_dict: dict[str, CIMComponentDefinition]):
+        """Constructor.
+
+        :param class_dict: Dictionary with all class definitions.
+        """
+        self.class_dict = class_dict
+        self.ancestors_map: dict[str, list[str]] = {}
+        self.descendants_map: dict[str, list[str]] = {}
+        self.inherited_attributes_map: dict[str, list[dict]] = {}
+        for class_name in class_dict:
+            self._add_ancestors(class_name)
+        descendants_map: dict[str, list[str]] = {}
+        for class_name, ancestors in self.ancestors_map.items():
+            for ancestor in ancestors:
+                descendants_map.setdefault(ancestor, []).append(class_name)
+        for class_name in class_dict:
+            self.descendants_map[class_name] = sorted(descendants_map.get(class_name, []))
+
+    def _add_ancestors(self, class_name: str) -> None:
+        # Go up until a class with known ancestors (or without superclass) is found,
+        # then set the ancestors of the classes on the way downwards.
+        path: list[str] = []
+        name = class_name
+        while name and name not in self.ancestors_map:
+            if name in path:
+                cycle = " -> ".join(path[path.index(name) :] + [name])
+                raise ValueError(f"Inheritance cycle: {cycle}")
+            path.append(name)
+            name = self.class_dict[name].subclass_of()
+        ancestors = self.ancestors_map.get(name, [])
+        for name in reversed(path):
+            superclass = self.class_dict[name].subclass_of()
+            ancestors = [superclass] + ancestors if superclass else []
+            self.ancestors_map[name] = ancestors
+
+    def ancestors(self, class_name: str) -> list[str]:
+        """Get the superclasses of a class, sorted upwards according to the hierarchy.
+
+        :param class_name: Name of the class.
+        :return:           List of superclasses.
+        """
+        return self.ancestors_map[class_name]
+
+    def descendants(self, class_name: str) -> list[str]:
+        """Get the subclasses of a class (including subclasses of subclasses), sorted alphabetically.
+
+        :param class_name: Name of the class.
+        :return:           List of subclasses.
+        """
+        return self.descendants_map[class_name]
+
+    def inherited_attributes(self, class_name: str) -> list[dict]:
+        """Get the attributes of a class and all its superclasses.
+
+        The attributes of the class come first, followed by the attributes of the superclasses upwards.
+
+        :param class_name: Name of the class.
+        :return:           List of attributes.
+        """
+        if class_name not in self.inherited_attributes_map:
+            attributes = list(self.class_dict[class_name].attributes())
+            superclass = self.class_dict[class_name].subclass_of()
+            if superclass:
+                attributes += self.inherited_attributes(superclass)
+            self.inherited_attributes_map[class_name] = attributes
+        return self.inherited_attributes_map[class_name]
+
+
+@lru_cache(maxsize=16384)
 def _wrap_and_clean(txt: str, width: int = 120, initial_indent="", subsequent_indent="    ") -> str:
     """
     Used for comments: make them fit within <width> character, including indentation.
+
+    The results are cached, because the same comments occur in several profiles and CGMES versions.
     """
+    return "\n".join(
+        textwrap.wrap(
+            _get_text_of_html(txt),
+            width=width,
+            initial_indent=initial_indent,
+            subsequent_indent=subsequent_indent,
+        )
+    )
+
+
+# Simple start, end and empty tags without "<" and ">" in attribute values
+_HTML_TAG = re.compile(
+    r"""</?([a-zA-Z][a-zA-Z0-9]*)(?:\s+[^\s"'<>/=]+(?:\s*=\s*(?:"[^"<>]*"|'[^'<>]*'|[^\s"'<>=`]+))?)*\s*/?>"""
+)
+_HTML_ENTITY = re.compile(r"&(?:([a-zA-Z][a-zA-Z0-9]*)|#([0-9]{1,7})|#[xX]([0-9a-fA-F]{1,6}));")
+# Tags with content which is not part of the text (or whitespace which is preserved)
+_HTML_SPECIAL_TAGS = ("script", "style", "template", "pre", "textarea")
+_HTML_WHITESPACE = " \n\t\f\r"
+
 
+def _get_text_of_html(txt: str) -> str:
+    """Get the text of a comment with HTML markup.
+
+    The result is the same as BeautifulSoup(txt, "html.parser").text. Most comments contain no markup at all, and
+    the markup of the others consists of simple tags and entities, which are handled here without an HTML parser.
+    Only for other markup (e.g. comments, script tags, "<" in the text) BeautifulSoup is used.
+
+    :param txt: Text with HTML markup.
+    :return:    Text without markup.
+    """
+    if "<" not in txt and "&" not in txt:
+        return _clean_html_whitespace(txt)
+    text_parts = []
+    position = 0
+    for tag in _HTML_TAG.finditer(txt):
+        if tag.group(1).lower() in _HTML_SPECIAL_TAGS:
+            return _get_text_of_html_with_beautiful_soup(txt)
+        text_parts.append(txt[position : tag.start()])
+        position = tag.end()
+    text_parts.append(txt[position:])
+    for index, text_part in enumerate(text_parts):
+        if "<" in text_part:
+            return _get_text_of_html_with_beautiful_soup(txt)
+        if "&" in text_part:
+            text_part = _replace_html_entities(text_part)
+            if text_part is None:
+                return _get_text_of_html_with_beautiful_soup(txt)
+        text_parts[index] = _clean_html_whitespace(text_part)
+    return "".join(text_parts)
+
+
+def _clean_html_whitespace(text: str) -> str:
+    # Text between two tags consisting only of whitespace is replaced by a single space or newline (like BeautifulSoup).
+    if not text or text.strip(_HTML_WHITESPACE):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _replace_html_entities(text: str) -> str | None:
+    # Replace named and numeric character references, None for unusual references (e.g. without semicolon).
+    parts = []
+    position = 0
+    for entity in _HTML_ENTITY.finditer(text):
+        name, decimal, hexadecimal = entity.groups()
+        if name:
+            character = html5.get(name + ";")
+        else:
+            codepoint = int(decimal) if decimal else int(hexadecimal, 16)
+            if 0x20 <= codepoint < 0x7F or 0xA0 <= codepoint < 0xD800 or 0xE000 <= codepoint < 0xFDD0:
+                character = chr(codepoint)
+            else:
+                character = None
+        if character is None or "&" in text[position : entity.start()]:
+            return None
+        parts.append(text[position : entity.start()])
+        parts.append(character)
+        position = entity.end()
+    if "&" in text[position:]:
+        return None
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def _get_text_of_html_with_beautiful_soup(txt: str) -> str:
     # Ignore MarkupResemblesLocatorWarning
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
 
         soup = BeautifulSoup(txt, "html.parser")
+    return soup.text
 
-    return "\n".join(
-        textwrap.wrap(
-            soup.text,
-            width=width,
-            initial_indent=initial_indent,
-            subsequent_indent=subsequent_indent,
+
+default_namespaces: dict[str, str] = {"md": "http://iec.ch/TC57/61970-552/ModelDescription/1#"}  # NOSONAR
+
+
+class GenerationSession:
+    """Namespaces, profile names and profile uris collected while parsing the RDF files of one generation run.
+
+    Each run of cim_generate uses its own session, so several generations in one process don't influence each other.
+    """
+
+    def __init__(self):
+        self.long_profile_names: dict[str, str] = {}
+        self.package_listed_by_short_name: dict[str, list[str]] = {}
+        self.all_namespaces: dict[str, str] = dict(default_namespaces)
+        self.used_namespaces: list[str] = []
+
+    def add_profile_to_packages(self, profile_name: str, short_profile_name: str, profile_uri_list: list[str]) -> None:
+        """Add profile_uris and set long profile_name.
+
+        :param profile_name:       Long name of the profile, e.g. "EquipmentVersion".
+        :param short_profile_name: Short name of the profile, e.g. "EQ".
+        :param profile_uri_list:   URIs of the profile.
+        """
+        uri_list = self.package_listed_by_short_name.setdefault(short_profile_name, [])
+        for uri in profile_uri_list:
+            if uri not in uri_list:
+                uri_list.append(uri)
+        self.long_profile_names[short_profile_name] = profile_name.removesuffix("Version").removesuffix("Profile")
+
+    def parse_namespaces(self, namespace_dict: dict) -> None:
+        """Parse the namespaces of the rdf file and save these in the dictionary all_namespaces.
+
+        If two rdf files contain the same namespace url with different keys only the first key is saved.
+        If two rdf files contain the same namespace key with different urls the second url is saved with key ns0, ns1,
+        etc.
+
+        :param namespace_dict: Dictionary which contains the namespace urls with keys "$xmlns:<ns>".
+        """
+        for k, v in namespace_dict.items():
+            if k.startswith("$xmlns:"):
+                ns = k.split(":")[1]
+                url = v if v.endswith("#") else v + "#"
+                if url not in self.all_namespaces.values():
+                    if ns in self.all_namespaces:
+                        ns = self._get_free_namespace_key()
+                    self.all_namespaces[ns] = url
+
+    def add_to_used_namespaces(self, namespace_url: str) -> None:
+        """Add a namespace url to the list used_namespaces.
+
+        :param namespace_url: URL to add to used_namespaces.
+        """
+        if namespace_url != "#" and namespace_url not in self.used_namespaces:
+            self.used_namespaces.append(namespace_url)
+
+    def get_used_namespaces(self) -> dict[str, str]:
+        """Construct a dictionary with the namespaces of the list used_namespaces using keys from all_namespaces.
+
+        If a namespace url is not found in all_namespaces it will be added to all_namespaces with key ns0, ns1, etc.
+
+        :return: Dictionary of used namespaces.
+        """
+        for url in self.used_namespaces:
+            if url not in self.all_namespaces.values():
+                self.all_namespaces[self._get_free_namespace_key()] = url
+        namespaces = {}
+        for ns, url in self.all_namespaces.items():
+            if ns in ("rdf", "md", "cim") or url in self.used_namespaces:
+                namespaces[ns] = url
+        return namespaces
+
+    def get_namespace(self, parsed_namespace: str) -> str:
+        """Get the namespace url, the cim namespace for "#".
+
+        :param parsed_namespace: Namespace as parsed from the rdf file.
+        :return:                 Namespace url.
+        """
+        if parsed_namespace == "#":
+            return self.all_namespaces["cim"]
+        return parsed_namespace
+
+    def is_excluded_namespace(self, namespace: str) -> bool:
+        """Check for the namespaces of the ModelDescription and DifferenceModel definitions.
+
+        :param namespace: Namespace url.
+        :return:          Is the namespace excluded from the generation?
+        """
+        return namespace in (self.all_namespaces.get("md"), self.all_namespaces.get("dm"))
+
+    def merge(self, other: "GenerationSession") -> None:
+        """Merge the session of a worker process, which has parsed one RDF file.
+
+        The session is merged in the same way as it would be collected when parsing the files one after another.
+
+        :param other: Session with the namespaces, profile names and profile uris found in one RDF file.
+        """
+        self.parse_namespaces(
+            {
+                "$xmlns:" + ns: url
+                for ns, url in other.all_namespaces.items()
+                if ns not in default_namespaces or default_namespaces[ns] != url
+            }
         )
-    )
+        for short_profile_name, profile_uri_list in other.package_listed_by_short_name.items():
+            uri_list = self.package_listed_by_short_name.setdefault(short_profile_name, [])
+            for uri in profile_uri_list:
+                if uri not in uri_list:
+                    uri_list.append(uri)
+            self.long_profile_names[short_profile_name] = other.long_profile_names[short_profile_name]
+        for url in other.used_namespaces:
+            self.add_to_used_namespaces(url)
+
+    def as_json(self) -> dict:
+        return {
+            "long_profile_names": self.long_profile_names,
+            "package_listed_by_short_name": self.package_listed_by_short_name,
+            "all_namespaces": self.all_namespaces,
+            "used_namespaces": self.used_namespaces,
+        }
 
+    @staticmethod
+    def from_json(json_object: dict) -> "GenerationSession":
+        session = GenerationSession()
+        session.long_profile_names = json_object["long_profile_names"]
+        session.package_listed_by_short_name = json_object["package_listed_by_short_name"]
+        session.all_namespaces = json_object["all_namespaces"]
+        session.used_namespaces = json_object["used_namespaces"]
+        return session
 
-long_profile_names: dict[str, str] = {}
-package_listed_by_short_name: dict[str, list[str]] = {}
-all_namespaces: dict[str, str] = {"md": "http://iec.ch/TC57/61970-552/ModelDescription/1#"}  # NOSONAR
-used_namespaces: list[str] = []
+    def _get_free_namespace_key(self) -> str:
+        idx = 0
+        while f"ns{idx}" in self.all_namespaces:
+            idx += 1
+        return f"ns{idx}"
 
 
 def _rdfs_entry_types(rdfs_entry: RDFSEntry, version: str) -> list[str]:
@@ -286,12 +595,12 @@ def _rdfs_entry_types(rdfs_entry: RDFSEntry, version: str) -> list[str]:
     Determine the types of RDFS entry. In some case an RDFS entry can be of more than 1 type.
     """
     entry_types: list[str] = []
-    if rdfs_entry.type():
-        if rdfs_entry.type() == "http://www.w3.org/2000/01/rdf-schema#Class":  # NOSONAR
+    if rdfs_entry.type:
+        if rdfs_entry.type == "http://www.w3.org/2000/01/rdf-schema#Class":  # NOSONAR
             entry_types.append("class")
-        elif rdfs_entry.type() == "http://www.w3.org/1999/02/22-rdf-syntax-ns#Property":  # NOSONAR
+        elif rdfs_entry.type == "http://www.w3.org/1999/02/22-rdf-syntax-ns#Property":  # NOSONAR
             entry_types.append("property")
-        elif rdfs_entry.type() not in (
+        elif rdfs_entry.type not in (
             "http://iec.ch/TC57/1999/rdf-schema-extensions-19990926#ClassCategory",  # NOSONAR
             "http://www.w3.org/2002/07/owl#Ontology",  # NOSONAR
         ):
@@ -309,55 +618,157 @@ def _rdfs_entry_types(rdfs_entry: RDFSEntry, version: str) -> list[str]:
 
 def _entry_types_version_2(rdfs_entry: RDFSEntry) -> list[str]:
     entry_types: list[str] = []
-    if rdfs_entry.stereotype():
-        if rdfs_entry.stereotype() == "Entsoe" and rdfs_entry.about()[-7:] == "Version":
+    if rdfs_entry.stereotype:
+        if rdfs_entry.stereotype == "Entsoe" and rdfs_entry.about[-7:] == "Version":
             entry_types.append("profile_name_v2_4")
         if (
-            rdfs_entry.stereotype() == "http://iec.ch/TC57/NonStandard/UML#attribute"  # NOSONAR
-            and rdfs_entry.label().startswith("entsoeURI")
+            rdfs_entry.stereotype == "http://iec.ch/TC57/NonStandard/UML#attribute"  # NOSONAR
+            and rdfs_entry.label.startswith("entsoeURI")
         ):
             entry_types.append("profile_iri_v2_4")
-        if rdfs_entry.label() == "shortName":
+        if rdfs_entry.label == "shortName":
             entry_types.append("short_profile_name_v2_4")
     return entry_types
 
 
 def _entry_types_version_3(rdfs_entry: RDFSEntry) -> list[str]:
     entry_types: list[str] = []
-    if rdfs_entry.type() == "http://iec.ch/TC57/1999/rdf-schema-extensions-19990926#ClassCategory":  # NOSONAR
+    if rdfs_entry.type == "http://iec.ch/TC57/1999/rdf-schema-extensions-19990926#ClassCategory":  # NOSONAR
         entry_types.append("profile_name_v3")
-    if rdfs_entry.about() == "Ontology":
+    if rdfs_entry.about == "Ontology":
         entry_types.append("profile_iri_v3")
-    if rdfs_entry.keyword():
+    if rdfs_entry.keyword:
         entry_types.append("short_profile_name_v3")
 
     return entry_types
 
 
-def _add_class(classes_map: dict[str, CIMComponentDefinition], rdfs_entry: RDFSEntry) -> None:
+def _add_class(
+    classes_map: dict[str, CIMComponentDefinition], rdfs_entry: RDFSEntry, session: GenerationSession
+) -> None:
     """
     Add class component to classes map
     """
     # Exclude DifferenceModel definitions
-    if rdfs_entry.namespace() == all_namespaces.get("dm"):
+    if rdfs_entry.namespace == session.all_namespaces.get("dm"):
         return
-    if rdfs_entry.label() in classes_map:
-        logger.error(f"Class {rdfs_entry.label()} already exists.")
-    classes_map[rdfs_entry.label()] = CIMComponentDefinition(rdfs_entry)
+    if rdfs_entry.label in classes_map:
+        logger.error(f"Class {rdfs_entry.label} already exists.")
+    classes_map[rdfs_entry.label] = CIMComponentDefinition(rdfs_entry)
+    session.add_to_used_namespaces(rdfs_entry.namespace)
 
 
-def _add_profile_to_packages(profile_name: str, short_profile_name: str, profile_uri_list: list[str]) -> None:
-    """
-    Add profile_uris and set long profile_name.
+class RDFDescriptionReader:
+    """Streaming reader for the rdf:Description elements of an RDF file.
+
+    The file is fed in chunks into an expat parser. Each rdf:Description is converted into a compact dictionary
+    as soon as its end tag has been read, so only one description is held in memory at a time.
+    The dictionaries have the same layout as the output of xmltodict (with attr_prefix="$" and cdata_key="_"):
+    attributes are stored with the prefix "$", text is stored with the key "_",
+    repeated elements are collected in lists and elements with only text are stored as string.
     """
-    uri_list = package_listed_by_short_name.setdefault(short_profile_name, [])
-    for uri in profile_uri_list:
-        if uri not in uri_list:
-            uri_list.append(uri)
-    long_profile_names[short_profile_name] = profile_name.removesuffix("Version").removesuffix("Profile")
 
+    def __init__(self, file: Path, root_callback: Callable[[dict[str, str]], None], chunk_size: int = 1 << 16):
+        """Constructor.
+
+        :param file:          Path to the RDF file.
+        :param root_callback: Function called with the attributes of the root element (e.g. the namespaces)
+                              before the first description is returned.
+        :param chunk_size:    Number of bytes read from the file at once.
+        """
+        self.file = file
+        self.root_callback = root_callback
+        self.chunk_size = chunk_size
+        self._depth = 0
+        self._in_description = False
+        self._item: dict | None = None
+        self._data: list[str] = []
+        self._stack: list[tuple[dict | None, list[str]]] = []
+        self._descriptions: list[dict] = []
+
+    def __iter__(self) -> Iterator[dict]:
+        parser = expat.ParserCreate("utf-8")
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._characters
+        # Don't expand entities defined in a DTD
+        parser.DefaultHandler = lambda data: None
+        parser.ExternalEntityRefHandler = lambda *args: 1
+        read_time = parse_time = 0.0
+        with self.file.open("rb") as f:
+            while True:
+                t0 = perf_counter()
+                chunk = f.read(self.chunk_size)
+                t1 = perf_counter()
+                read_time += t1 - t0
+                if not chunk:
+                    break
+                parser.Parse(chunk, False)
+                parse_time += perf_counter() - t1
+                yield from self._pop_descriptions()
+            t0 = perf_counter()
+            parser.Parse(b"", True)
+            parse_time += perf_counter() - t0
+        profiling.add_time("read_file", str(self.file), read_time)
+        profiling.add_time("xml_parse", str(self.file), parse_time)
+        yield from self._pop_descriptions()
+
+    def _pop_descriptions(self) -> list[dict]:
+        descriptions = self._descriptions
+        self._descriptions = []
+        return descriptions
+
+    def _start_element(self, name: str, attrs: list[str]) -> None:
+        self._depth += 1
+        attributes = {"$" + attrs[i]: attrs[i + 1] for i in range(0, len(attrs), 2)}
+        if self._depth == 1:
+            self.root_callback(attributes)
+            return
+        if self._depth == 2:
+            self._in_description = name == "rdf:Description"
+        elif self._in_description:
+            self._stack.append((self._item, self._data))
+        if self._in_description:
+            self._item = attributes or None
+            self._data = []
+
+    def _end_element(self, name: str) -> None:
+        if self._in_description:
+            data = "".join(self._data).strip() or None
+            item = self._item
+            if item is not None and data:
+                item["_"] = data
+            if self._depth == 2:
+                self._descriptions.append(item or {})
+                self._in_description = False
+            else:
+                self._item, self._data = self._stack.pop()
+                self._item = RDFDescriptionReader._push(self._item, name, data if item is None else item)
+        self._depth -= 1
+
+    def _characters(self, data: str) -> None:
+        if self._in_description:
+            self._data.append(data)
+
+    # Add a value to a dictionary, a repeated key turns the value into a list
+    @staticmethod
+    def _push(item: dict | None, key: str, value: dict | str | None) -> dict:
+        if item is None:
+            item = {}
+        if key not in item:
+            item[key] = value
+        elif isinstance(item[key], list):
+            item[key].append(value)
+        else:
+            item[key] = [item[key], value]
+        return item
 
-def _parse_rdf(input_dic: dict, version: str) -> dict[str, dict[str, CIMComponentDefinition]]:  # NOSONAR
+
+def _parse_rdf(  # NOSONAR
+    file: Path, version: str, session: GenerationSession
+) -> dict[str, dict[str, CIMComponentDefinition]]:
     classes_map: dict[str, CIMComponentDefinition] = {}
     profile_name: str = ""
     short_profile_name: str = ""
@@ -365,43 +776,41 @@ def _parse_rdf(input_dic: dict, version: str) -> dict[str, dict[str, CIMComponen
     attributes: list[dict] = []
     enum_instances: list[dict] = []
 
-    _parse_namespaces(input_dic["rdf:RDF"])
-
-    # Generates list with dictionaries as elements
-    descriptions: list[dict] = input_dic["rdf:RDF"]["rdf:Description"]
+    # The namespaces of the root element are parsed before the first description is read
+    descriptions = RDFDescriptionReader(file, session.parse_namespaces)
 
-    # Iterate over list elements
+    # Iterate over descriptions
     for list_elem in descriptions:
         rdfs_entry = RDFSEntry(list_elem)
         object_dic = rdfs_entry.as_json()
         rdfs_entry_types = _rdfs_entry_types(rdfs_entry, version)
 
         if "class" in rdfs_entry_types:
-            _add_class(classes_map, rdfs_entry)
+            _add_class(classes_map, rdfs_entry, session)
         if "property" in rdfs_entry_types:
             attributes.append(object_dic)
         if "rest_non_class_category" in rdfs_entry_types:
             enum_instances.append(object_dic)
         if not profile_name:
             if "profile_name_v2_4" in rdfs_entry_types:
-                profile_name = rdfs_entry.about()
+                profile_name = rdfs_entry.about
             if "profile_name_v3" in rdfs_entry_types:
-                profile_name = rdfs_entry.label()
+                profile_name = rdfs_entry.label
         if not short_profile_name:
-            if "short_profile_name_v2_4" in rdfs_entry_types and rdfs_entry.is_fixed():
-                short_profile_name = rdfs_entry.is_fixed()
+            if "short_profile_name_v2_4" in rdfs_entry_types and rdfs_entry.is_fixed:
+                short_profile_name = rdfs_entry.is_fixed
             if "short_profile_name_v3" in rdfs_entry_types:
-                short_profile_name = rdfs_entry.keyword()
-        if "profile_iri_v2_4" in rdfs_entry_types and rdfs_entry.is_fixed():
-            profile_uri_list.append(rdfs_entry.is_fixed())
+                short_profile_name = rdfs_entry.keyword
+        if "profile_iri_v2_4" in rdfs_entry_types and rdfs_entry.is_fixed:
+            profile_uri_list.append(rdfs_entry.is_fixed)
         if "profile_iri_v3" in rdfs_entry_types:
-            profile_uri_list.append(rdfs_entry.version_iri())
+            profile_uri_list.append(rdfs_entry.version_iri)
 
-    _add_profile_to_packages(profile_name, short_profile_name, profile_uri_list)
+    session.add_profile_to_packages(profile_name, short_profile_name, profile_uri_list)
 
     # Add attributes to corresponding class
     for attribute in attributes:
-        if _check_attribute_for_class(classes_map, attribute):
+        if _check_attribute_for_class(classes_map, attribute, session):
             classes_map[attribute["domain"]].add_attribute(attribute)
 
     # Add enum instances to corresponding class
@@ -415,76 +824,136 @@ def _parse_rdf(input_dic: dict, version: str) -> dict[str, dict[str, CIMComponen
     return {short_profile_name: classes_map}
 
 
+def _parse_rdf_in_worker(
+    file: Path, version: str
+) -> tuple[dict[str, dict[str, CIMComponentDefinition]], GenerationSession]:
+    """Parse an RDF file in a worker process.
+
+    The file is parsed with a new session, so that the returned session contains only the namespaces,
+    profile names and profile uris found in this file.
+
+    :param file:    Path to the RDF file.
+    :param version: CGMES version, e.g. version = "cgmes_v2_4_15"
+    :return:        Result of _parse_rdf and the session to be merged with GenerationSession.merge.
+    """
+    logger.info(f"Start of parsing file '{file}'.")
+    session = GenerationSession()
+    with profiling.phase("parse_rdf", file=str(file)):
+        parsed = _parse_rdf(file, version, session)
+    return parsed, session
+
+
+def _parse_rdf_files_parallel(
+    files: list[Path], version: str, jobs: int, session: GenerationSession
+) -> list[dict[str, dict[str, CIMComponentDefinition]]]:
+    """Parse RDF files in worker processes.
+
+    The results are merged in the order of the files, so the result is the same as parsing the files one after another.
+
+    :param files:   Paths to the RDF files.
+    :param version: CGMES version, e.g. version = "cgmes_v2_4_15"
+    :param jobs:    Number of worker processes.
+    :param session: Session of the generation run, the sessions of the workers are merged into it.
+    :return:        List of the results of _parse_rdf.
+    """
+    profiles_array: list[dict[str, dict[str, CIMComponentDefinition]]] = []
+    profile_settings = profiling.get_worker_settings()
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        for (parsed, worker_session), profile_data in executor.map(
+            profiling.run_in_worker, repeat(profile_settings), repeat(_parse_rdf_in_worker), files, repeat(version)
+        ):
+            session.merge(worker_session)
+            profiling.merge_worker_data(profile_data, worker=True)
+            profiles_array.append(parsed)
+    return profiles_array
+
+
 # This function extracts all information needed for the creation of the class files like the comments or the
 # class name. After the extraction the function _write_files is called to write the files with the template engine
 # chevron
 def _write_all_files(
-    elem_dict: dict[str, CIMComponentDefinition], lang_pack: ModuleType, output_path: str, version: str
+    elem_dict: dict[str, CIMComponentDefinition],
+    lang_pack: ModuleType,
+    output_path: str,
+    version: str,
+    session: GenerationSession,
+    jobs: int = 1,
 ) -> None:
     # Setup called only once: make output directory, create base class, create profile class, etc.
-    lang_pack.setup(output_path, version, _get_profile_details(package_listed_by_short_name), _get_used_namespaces())
-
-    recommended_class_profiles = _get_recommended_class_profiles(elem_dict)
-
-    for class_name in elem_dict.keys():
-        class_details = {
-            "attributes": elem_dict[class_name].attributes(),
-            "class_location": lang_pack.get_class_location(class_name, elem_dict, version),
-            "class_name": class_name,
-            "class_origin": _get_sorted_profile_keys(elem_dict[class_name].origins()),
-            "class_namespace": _get_namespace(elem_dict[class_name].namespace),
-            "enum_instances": elem_dict[class_name].enum_instances(),
-            "is_an_enum_class": elem_dict[class_name].is_an_enum_class(),
-            "is_a_primitive_class": elem_dict[class_name].is_a_primitive_class(),
-            "is_a_datatype_class": elem_dict[class_name].is_a_datatype_class(),
-            "lang_pack": lang_pack,
-            "subclass_of": elem_dict[class_name].subclass_of(),
-            "superclasses": elem_dict[class_name].superclasses(),
-            "subclasses": elem_dict[class_name].subclasses(),
-            "recommended_class_profile": recommended_class_profiles[class_name],
-        }
-
-        # Exclude ModelDescription and DifferenceModel definitions
-        if class_details["class_namespace"] in (all_namespaces.get("md"), all_namespaces.get("dm")):
-            continue
-
-        # extract comments
-        if elem_dict[class_name].comment:
-            class_details["class_comment"] = elem_dict[class_name].comment
-            class_details["wrapped_class_comment"] = _wrap_and_clean(
-                elem_dict[class_name].comment,
-                width=116,
-                initial_indent="",
-                subsequent_indent=" " * 6,
-            )
-
-        for attribute in class_details["attributes"]:
-            if "comment" in attribute:
-                attribute["comment"] = attribute["comment"].replace('"', "`")
-                attribute["comment"] = attribute["comment"].replace("'", "`")
-                attribute["wrapped_comment"] = _wrap_and_clean(
-                    attribute["comment"],
-                    width=114 - len(attribute["label"]),
+    with profiling.phase("setup"):
+        lang_pack.setup(output_path, version, _get_profile_details(session), session.get_used_namespaces())
+
+    with profiling.phase("recommended_class_profiles"):
+        recommended_class_profiles = _get_recommended_class_profiles(elem_dict, ClassHierarchy(elem_dict))
+
+    # Extract the class and attribute infos of all classes first, so that this enrichment is measured separately
+    # from rendering and writing the class files.
+    all_class_details = []
+    with profiling.phase("enrichment"):
+        for class_name in elem_dict.keys():
+            class_details = {
+                "attributes": elem_dict[class_name].attributes(),
+                "class_location": lang_pack.get_class_location(class_name, elem_dict, version),
+                "class_name": class_name,
+                "class_origin": _get_sorted_profile_keys(elem_dict[class_name].origins()),
+                "class_namespace": session.get_namespace(elem_dict[class_name].namespace),
+                "enum_instances": elem_dict[class_name].enum_instances(),
+                "is_an_enum_class": elem_dict[class_name].is_an_enum_class(),
+                "is_a_primitive_class": elem_dict[class_name].is_a_primitive_class(),
+                "is_a_datatype_class": elem_dict[class_name].is_a_datatype_class(),
+                "lang_pack": lang_pack,
+                "subclass_of": elem_dict[class_name].subclass_of(),
+                "superclasses": elem_dict[class_name].superclasses(),
+                "subclasses": elem_dict[class_name].subclasses(),
+                "recommended_class_profile": recommended_class_profiles[class_name],
+            }
+
+            # Exclude ModelDescription and DifferenceModel definitions
+            if session.is_excluded_namespace(class_details["class_namespace"]):
+                continue
+
+            # extract comments
+            if elem_dict[class_name].comment:
+                class_details["class_comment"] = elem_dict[class_name].comment
+                class_details["wrapped_class_comment"] = _wrap_and_clean(
+                    elem_dict[class_name].comment,
+                    width=116,
                     initial_indent="",
                     subsequent_indent=" " * 6,
                 )
-            attribute_class = _get_attribute_class(attribute)
-            attribute_type = _get_attribute_type(attribute, elem_dict[attribute_class])
-            attribute["is_class_attribute"] = _get_bool_string(attribute_type == "class")
-            attribute["is_enum_attribute"] = _get_bool_string(attribute_type == "enum")
-            attribute["is_list_attribute"] = _get_bool_string(attribute_type == "list")
-            attribute["is_primitive_attribute"] = _get_bool_string(attribute_type == "primitive")
-            attribute["is_datatype_attribute"] = _get_bool_string(attribute_type == "datatype")
-            attribute["attribute_class"] = attribute_class
-            attribute["attribute_namespace"] = _get_namespace(attribute["namespace"])
-            attribute["is_attribute_with_inverse_list"] = _get_bool_string(
-                _is_attribute_with_inverse_list(attribute, elem_dict)
-            )
-            attribute["attr_origin"] = _get_sorted_profile_keys(attribute["attr_origin"])
-            _check_inverse_role(attribute, elem_dict)
 
-        class_details["attributes"].sort(key=lambda d: d["label"])
-        _write_files(class_details, output_path)
+            for attribute in class_details["attributes"]:
+                if "comment" in attribute:
+                    attribute["comment"] = attribute["comment"].replace('"', "`")
+                    attribute["comment"] = attribute["comment"].replace("'", "`")
+                    attribute["wrapped_comment"] = _wrap_and_clean(
+                        attribute["comment"],
+                        width=114 - len(attribute["label"]),
+                        initial_indent="",
+                        subsequent_indent=" " * 6,
+                    )
+                attribute_class = _get_attribute_class(attribute)
+                attribute_type = _get_attribute_type(attribute, elem_dict[attribute_class])
+                attribute["is_class_attribute"] = _get_bool_string(attribute_type == "class")
+                attribute["is_enum_attribute"] = _get_bool_string(attribute_type == "enum")
+                attribute["is_list_attribute"] = _get_bool_string(attribute_type == "list")
+                attribute["is_primitive_attribute"] = _get_bool_string(attribute_type == "primitive")
+                attribute["is_datatype_attribute"] = _get_bool_string(attribute_type == "datatype")
+                attribute["attribute_class"] = attribute_class
+                attribute["attribute_namespace"] = session.get_namespace(attribute["namespace"])
+                attribute["is_attribute_with_inverse_list"] = _get_bool_string(
+                    _is_attribute_with_inverse_list(attribute, elem_dict)
+                )
+                attribute["attr_origin"] = _get_sorted_profile_keys(attribute["attr_origin"])
+                _check_inverse_role(attribute, elem_dict)
+
+            class_details["attributes"].sort(key=lambda d: d["label"])
+            all_class_details.append(class_details)
+
+    # The class files are rendered by worker processes if there is more than one job.
+    with profiling.phase("class_files"), rendering.render_in_parallel(jobs):
+        for class_details in all_class_details:
+            _write_files(class_details, output_path)
 
 
 # Some names are encoded as #name or http://some-url#name
@@ -511,7 +980,7 @@ def _write_files(class_details: dict, output_path: str) -> None:
 
 
 def _merge_profiles_and_classes(
-    profiles_array: list[dict[str, dict[str, CIMComponentDefinition]]],
+    profiles_array: list[dict[str, dict[str, CIMComponentDefinition]]], session: GenerationSession
 ) -> dict[str, CIMComponentDefinition]:
     """Merge class infos of all profiles.
 
@@ -521,6 +990,7 @@ def _merge_profiles_and_classes(
     and used to generate the possible profile list used for the serialization.
 
     :param profiles_array: List of profiles containing class infos.
+    :param session:        Session of the generation run.
     :return:               Map of class name to class info.
     """
     class_dict: dict[str, CIMComponentDefinition] = {}
@@ -531,7 +1001,7 @@ def _merge_profiles_and_classes(
             # Iterate over classes and check for multiple class definitions
             for class_key, new_class_infos in new_class_dict.items():
                 if class_key in class_dict:
-                    _merge_class_infos(class_dict[class_key], new_class_infos, origin)
+                    _merge_class_infos(class_dict[class_key], new_class_infos, origin, session)
                 else:
                     # store new class and origin
                     new_class_infos.add_origin(origin)
@@ -542,7 +1012,10 @@ def _merge_profiles_and_classes(
 
 
 def _merge_class_infos(
-    class_infos: CIMComponentDefinition, new_class_infos: CIMComponentDefinition, origin: str
+    class_infos: CIMComponentDefinition,
+    new_class_infos: CIMComponentDefinition,
+    origin: str,
+    session: GenerationSession,
 ) -> None:
     """Merge infos of a class with class infos from another profile file.
 
@@ -552,6 +1025,8 @@ def _merge_class_infos(
 
     :param class_infos:     Information about a class.
     :param new_class_infos: Information about a class from another profile file.
+    :param origin:          Short name of the profile of new_class_infos.
+    :param session:         Session of the generation run.
     """
     # some inheritance information is stored only in one of the packages. Therefore it has to be checked
     # if the subclass_of attribute is set. See for example TopologicalNode definitions in SV and TP.
@@ -561,120 +1036,816 @@ def _merge_class_infos(
         class_infos.comment = new_class_infos.comment
     if origin not in class_infos.origins():
         class_infos.add_origin(origin)
-    _check_merge_class(class_infos, new_class_infos)
+    _check_merge_class(class_infos, new_class_infos, session)
     for new_attr in new_class_infos.attributes():
-        for attr in class_infos.attributes():
-            if attr["label"] == new_attr["label"]:
-                # attribute already in attributes list, check if origin is new
-                origin_list = attr["attr_origin"]
-                if origin not in origin_list:
-                    origin_list.append(origin)
-                _check_merge_attribute(class_infos.about, attr, new_attr)
-                break
+        attr = class_infos.attribute(new_attr["label"])
+        if attr:
+            # attribute already in attributes list, check if origin is new
+            origin_list = attr["attr_origin"]
+            if origin not in origin_list:
+                origin_list.append(origin)
+            _check_merge_attribute(class_infos.about, attr, new_attr)
         else:
             # new attribute
             new_attr["attr_origin"] = [origin]
             class_infos.add_attribute(new_attr)
     for new_enum in new_class_infos.enum_instances():
-        for enum in class_infos.enum_instances():
-            if new_enum["label"] == enum["label"]:
-                _check_merge_enum(class_infos.about, enum, new_enum)
-                break
+        enum = class_infos.enum_instance(new_enum["label"])
+        if enum:
+            _check_merge_enum(class_infos.about, enum, new_enum)
         else:
             class_infos.add_enum_instance(new_enum)
 
 
-def _add_superclasses_of_superclasses(class_dict: dict[str, CIMComponentDefinition]) -> None:
+def _add_superclasses_of_superclasses(class_dict: dict[str, CIMComponentDefinition], hierarchy: ClassHierarchy) -> None:
     """Set the list of superclasses for each class.
 
-    The algorithm searches superclasses of superclasses recursively. The resulting lists are set as attribute
-    superclasses in the class definition. They are sorted upwards according to the hierarchy.
+    The resulting lists are set as attribute superclasses in the class definition.
+    They are sorted upwards according to the hierarchy.
 
     :param class_dict:  Dictionary with all class definitions.
+    :param hierarchy:   Class hierarchy of class_dict.
     """
     for class_name in class_dict:
-        superclass_list = []
-        superclass = class_dict[class_name].subclass_of()
-        while superclass:
-            superclass_list.append(superclass)
-            superclass = class_dict[superclass].subclass_of()
-        class_dict[class_name].set_superclasses(superclass_list)
+        class_dict[class_name].set_superclasses(hierarchy.ancestors(class_name))
 
 
-def _add_subclasses_of_subclasses(class_dict: dict[str, CIMComponentDefinition]) -> None:
+def _add_subclasses_of_subclasses(class_dict: dict[str, CIMComponentDefinition], hierarchy: ClassHierarchy) -> None:
     """Set the list of subclasses for each class.
 
-    The algorithm searches subclasses of subclasses using the attribute superclasses of all classes. The superclasses
-    lists must therefore have been filled beforehand. The resulting lists are set as attribute subclasses in the class
-    definition. They are sorted alphabetically.
+    The resulting lists (including subclasses of subclasses) are set as attribute subclasses in the class definition.
+    They are sorted alphabetically.
 
     :param class_dict:  Dictionary with all class definitions.
+    :param hierarchy:   Class hierarchy of class_dict.
     """
-    subclasses_map: dict[str, set[str]] = {}
     for class_name in class_dict:
-        for superclass in class_dict[class_name].superclasses():
-            subclasses_map.setdefault(superclass, set()).add(class_name)
-    for class_name in class_dict:
-        class_dict[class_name].set_subclasses(sorted(subclasses_map.get(class_name, set())))
-
-
-def cim_generate(directory: Path, output_path: str, version: str, lang_pack: ModuleType) -> None:
+        class_dict[class_name].set_subclasses(hierarchy.descendants(class_name))
+
+
+def cim_generate(
+    directory: Path,
+    output_path: str,
+    version: str,
+    lang_pack: ModuleType,
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    incremental: bool = False,
+    template_engine: str = "compiled",
+    profiles: list[str] | None = None,
+    root_classes: list[str] | None = None,
+    follow_associations: bool = False,
+    pruning_report: Path | None = None,
+) -> None:
     """Generates cgmes classes from cgmes ontology
 
-    This function uses package xmltodict to parse the RDF files. The _parse_rdf function sorts the classes to
-    the corresponding packages. Since multiple files can be read, e.g. Equipment Core and Equipment Short Circuit, the
-    classes of these profiles are merged into one profile with _merge_profiles. After that the _merge_classes
-    function merges classes defined in multiple profiles into one class and tracks the origin of the class and their
-    attributes. This information is stored in the class variable possibleProfileList and used for serialization.
-    For more information see the cimexport function in the cimpy package. Finally the _write_all_files function
-    extracts all information needed for the creation of the language specific files and creates them
-    with the template engine chevron. The attribute version of this function defines the name of the folder where the
+    This function reads the RDF files with a streaming parser, so only one rdf:Description is held in memory at a
+    time. The _parse_rdf function sorts the classes to the corresponding packages. The files could be parsed in
+    parallel by several worker processes. Since multiple files can be read, e.g. Equipment Core and Equipment Short
+    Circuit, the classes of these profiles are merged into one profile with _merge_profiles. After that the
+    _merge_classes function merges classes defined in multiple profiles into one class and tracks the origin of the
+    class and their attributes. This information is stored in the class variable possibleProfileList and used for
+    serialization. For more information see the cimexport function in the cimpy package. Finally the _write_all_files
+    function extracts all information needed for the creation of the language specific files and creates them with
+    the template engine chevron. The attribute version of this function defines the name of the folder where the
     created classes are stored. This folder should not exist and is created in the class generation procedure.
+    If a cache directory is given, the merged classes are stored there and reused by later runs with the same schema
+    files, CGMES version and cimgen version, so that parsing and merging are skipped.
+    In incremental mode existing files are only overwritten if their content has changed.
 
     :param directory: path to RDF files containing cgmes ontology,
                       e.g. directory = "./examples/cgmes_schema/cgmes_v2_4_15_schema"
     :param output_path: The output directory
     :param version:     CGMES version, e.g. version = "cgmes_v2_4_15"
     :param lang_pack:   python module containing language specific functions
+    :param jobs:        Number of worker processes used to parse the RDF files and to render the class files
+                        (1: no worker processes)
+    :param cache_dir:   Directory of the cache for the merged classes (None: no cache)
+    :param incremental: Write only files with changed content and remove only stale files
+    :param template_engine: Engine used to render the templates: "compiled" (templates compiled to python functions),
+                            "chevron" or "verify" (render with both and log the differences)
+    :param profiles:    Short names of the profiles to generate, e.g. ["EQ", "SSH"], the classes of other profiles
+                        are only generated if needed by these profiles (None: all profiles)
+    :param root_classes: Names of the classes to generate, e.g. ["ACLineSegment", "Terminal"], together with their
+                         superclasses and the classes of their attributes (None: all classes)
+    :param follow_associations: Generate also the classes of associations of the root classes (and so on)
+    :param pruning_report: Path of a JSON report with the kept and the pruned classes (None: no report)
     """
-    profiles_array: list[dict[str, dict[str, CIMComponentDefinition]]] = []
+    cim_generate_languages(
+        directory,
+        [(lang_pack, output_path)],
+        version,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        incremental=incremental,
+        template_engine=template_engine,
+        profiles=profiles,
+        root_classes=root_classes,
+        follow_associations=follow_associations,
+        pruning_report=pruning_report,
+    )
+
 
+def cim_generate_languages(
+    directory: Path,
+    targets: list[tuple[ModuleType, str]],
+    version: str,
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    incremental: bool = False,
+    template_engine: str = "compiled",
+    profiles: list[str] | None = None,
+    root_classes: list[str] | None = None,
+    follow_associations: bool = False,
+    pruning_report: Path | None = None,
+    export_bundle: Path | None = None,
+    out_archive: Path | None = None,
+    check: bool = False,
+    manifest: Path | None = None,
+) -> dict[str, list[str]] | None:
+    """Generates cgmes classes for several languages from one parse of the cgmes ontology
+
+    The RDF files are parsed and merged only once (see cim_generate), then the files of every language are generated
+    from this model. The language packages change the attribute dictionaries of the classes while writing the files,
+    therefore every language gets its own copy of the model. If there is more than one job, the languages are
+    generated in parallel by worker processes, the jobs are divided between the languages.
+
+    :param directory: path to RDF files containing cgmes ontology,
+                      e.g. directory = "./examples/cgmes_schema/cgmes_v2_4_15_schema"
+    :param targets:     List of the language packages (python modules containing language specific functions)
+                        and their output directories
+    :param version:     CGMES version, e.g. version = "cgmes_v2_4_15"
+    :param jobs:        Number of worker processes used to parse the RDF files and to generate the languages or to
+                        render the class files (1: no worker processes)
+    :param cache_dir:   Directory of the cache for the merged classes (None: no cache)
+    :param incremental: Write only files with changed content and remove only stale files
+    :param template_engine: Engine used to render the templates: "compiled" (templates compiled to python functions),
+                            "chevron" or "verify" (render with both and log the differences)
+    :param profiles:    Short names of the profiles to generate, see cim_generate (None: all profiles)
+    :param root_classes: Names of the classes to generate, see cim_generate (None: all classes)
+    :param follow_associations: Generate also the classes of associations of the root classes (and so on)
+    :param pruning_report: Path of a JSON report with the kept and the pruned classes (None: no report)
+    :param export_bundle: Path of a model bundle with the merged classes of all profiles, which can be used by
+                          cim_generate_from_bundle instead of the RDF files (None: no bundle)
+    :param out_archive: Path of a zip or tar archive (.zip, .tar, .tar.gz or .tgz) the generated files are written to
+                        instead of the output directories, the paths in the archive are relative to the output
+                        directory (of one target) or to the common parent directory (of several targets)
+                        (None: write the files into the output directories)
+    :param check:       Render the files in memory and compare them with the files in the output directories
+                        (or with the manifest) instead of writing them
+    :param manifest:    Path of a manifest with the content hashes of the generated files: written after the
+                        generation, or compared with in check mode (None: no manifest)
+    :return:            Differing, missing and stale files in check mode (see output_writer.CheckWriter),
+                        otherwise None
+    """
     t0 = time()
 
-    # Iterate over RDF files: first in the main directory, than in subdirectories
-    for file in sorted(directory.glob("*.rdf")) + sorted(directory.glob("*/**/*.rdf")):
-        logger.info(f"Start of parsing file '{file}'.")
+    files = _get_schema_files(directory)
 
-        xmlstring = file.read_text(encoding="utf-8")
+    cached = None
+    if cache_dir:
+        with profiling.phase("load_cache"):
+            cache_key = schema_cache.get_cache_key(directory, files, version)
+            cached = schema_cache.load(cache_dir, cache_key)
+    if cached:
+        logger.info(f"Use cached classes for schema directory '{directory}'.")
+        class_dict_with_origins, session = cached
+    else:
+        session = GenerationSession()
+        class_dict_with_origins = _build_class_dict(files, version, jobs, session)
+        if cache_dir:
+            with profiling.phase("store_cache"):
+                schema_cache.store(cache_dir, cache_key, (class_dict_with_origins, session))
+
+    if export_bundle:
+        with profiling.phase("export_bundle"):
+            export_model_bundle(export_bundle, class_dict_with_origins, session, version)
+
+    differences = _generate_languages_from_model(
+        class_dict_with_origins,
+        session,
+        targets,
+        version,
+        jobs,
+        incremental,
+        template_engine,
+        profiles,
+        root_classes,
+        follow_associations,
+        pruning_report,
+        out_archive,
+        check,
+        manifest,
+    )
+
+    logger.info(f"Elapsed Time: {time() - t0}s")
+    return differences
+
+
+def cim_generate_from_bundle(
+    bundle: Path,
+    targets: list[tuple[ModuleType, str]],
+    jobs: int = 1,
+    incremental: bool = False,
+    template_engine: str = "compiled",
+    profiles: list[str] | None = None,
+    root_classes: list[str] | None = None,
+    follow_associations: bool = False,
+    pruning_report: Path | None = None,
+    out_archive: Path | None = None,
+    check: bool = False,
+    manifest: Path | None = None,
+) -> dict[str, list[str]] | None:
+    """Generates cgmes classes for several languages from a model bundle instead of the cgmes ontology
+
+    The bundle contains the merged classes and the CGMES version, see cim_generate_languages (export_bundle),
+    so the RDF files are neither parsed nor merged.
+
+    :param bundle:      Path of the model bundle.
+    :param targets:     List of the language packages (python modules containing language specific functions)
+                        and their output directories
+    :param jobs:        Number of worker processes used to generate the languages or to render the class files
+                        (1: no worker processes)
+    :param incremental: Write only files with changed content and remove only stale files
+    :param template_engine: Engine used to render the templates, see cim_generate
+    :param profiles:    Short names of the profiles to generate, see cim_generate (None: all profiles)
+    :param root_classes: Names of the classes to generate, see cim_generate (None: all classes)
+    :param follow_associations: Generate also the classes of associations of the root classes (and so on)
+    :param pruning_report: Path of a JSON report with the kept and the pruned classes (None: no report)
+    :param out_archive: Path of a zip or tar archive the generated files are written to, see cim_generate_languages
+                        (None: write the files into the output directories)
+    :param check:       Compare the files instead of writing them, see cim_generate_languages
+    :param manifest:    Path of a manifest with the content hashes of the generated files, see cim_generate_languages
+    :return:            Differing, missing and stale files in check mode, otherwise None
+    """
+    t0 = time()
+
+    with profiling.phase("load_bundle"):
+        class_dict, session, version = load_model_bundle(bundle)
+    logger.info(f"Use model bundle '{bundle}' with CGMES version {version}.")
+
+    differences = _generate_languages_from_model(
+        class_dict,
+        session,
+        targets,
+        version,
+        jobs,
+        incremental,
+        template_engine,
+        profiles,
+        root_classes,
+        follow_associations,
+        pruning_report,
+        out_archive,
+        check,
+        manifest,
+    )
+
+    logger.info(f"Elapsed Time: {time() - t0}s")
+    return differences
+
+
+def export_model_bundle(
+    path: Path, class_dict: dict[str, CIMComponentDefinition], session: GenerationSession, version: str
+) -> None:
+    """Export the merged classes to a model bundle.
+
+    The bundle is a versioned JSON file (compressed with gzip if the path ends with ".gz") with the classes
+    (attributes, enum instances, origins, superclasses, subclasses and recommended profile), the profiles
+    and the namespaces. It can be read by other generators without parsing the RDF files.
+
+    :param path:       Path of the bundle, e.g. "model.json" or "model.json.gz".
+    :param class_dict: Map of class name to merged class info including superclasses and subclasses.
+    :param session:    Session of the generation run.
+    :param version:    CGMES version, e.g. version = "cgmes_v2_4_15"
+    """
+    recommended_class_profiles = _get_recommended_class_profiles(class_dict, ClassHierarchy(class_dict))
+    classes = {}
+    for class_name, class_infos in class_dict.items():
+        classes[class_name] = class_infos.as_json()
+        # Only informative for other generators, it is computed again from the classes when generating files
+        classes[class_name]["recommended_class_profile"] = recommended_class_profiles[class_name]
+    model_bundle.dump(path, version, {"session": session.as_json(), "classes": classes})
+
+
+def load_model_bundle(path: Path) -> tuple[dict[str, CIMComponentDefinition], GenerationSession, str]:
+    """Load the merged classes from a model bundle written by export_model_bundle.
+
+    :param path: Path of the bundle.
+    :return:     Map of class name to merged class info, session and CGMES version.
+    """
+    version, model = model_bundle.load(path)
+    class_dict = {
+        class_name: CIMComponentDefinition.from_json(class_json) for class_name, class_json in model["classes"].items()
+    }
+    return class_dict, GenerationSession.from_json(model["session"]), version
+
+
+def _generate_languages_from_model(
+    class_dict_with_origins: dict[str, CIMComponentDefinition],
+    session: GenerationSession,
+    targets: list[tuple[ModuleType, str]],
+    version: str,
+    jobs: int,
+    incremental: bool,
+    template_engine: str,
+    profiles: list[str] | None,
+    root_classes: list[str] | None,
+    follow_associations: bool,
+    pruning_report: Path | None,
+    out_archive: Path | None,
+    check: bool,
+    manifest: Path | None,
+) -> dict[str, list[str]] | None:
+    """Select the profiles and classes and generate the files of all languages, see cim_generate_languages."""
+    # The profiles are selected after caching, so the cache could be used for any selection of profiles.
+    class_dict_with_origins = _select_classes(
+        class_dict_with_origins,
+        session,
+        profiles,
+        root_classes,
+        follow_associations,
+        pruning_report,
+        [lang_pack for lang_pack, _ in targets],
+    )
+
+    output_paths = [output_path for _, output_path in targets]
+    root = Path(output_paths[0]) if len(output_paths) == 1 else Path(os.path.commonpath(output_paths))
+    record_hashes = manifest is not None and not check
+    # The archive and the check writer are used for all languages
+    shared_writer: output_writer.OutputWriter | None = None
+    if check:
+        shared_writer = output_writer.CheckWriter(root, output_writer.read_manifest(manifest) if manifest else None)
+    elif out_archive:
+        shared_writer = output_writer.ArchiveWriter(out_archive, root, record_hashes)
+    hashes: dict[Path, str] = {}
+    try:
+        if len(targets) == 1:
+            lang_pack, output_path = targets[0]
+            hashes |= _generate_language(
+                class_dict_with_origins,
+                session,
+                lang_pack,
+                output_path,
+                version,
+                jobs,
+                incremental,
+                template_engine,
+                shared_writer,
+                record_hashes,
+            )
+        else:
+            # Every language gets its own copy of the model, created from the serialized model.
+            with profiling.phase("serialize_model"):
+                pickled_model = pickle.dumps((class_dict_with_origins, session), protocol=pickle.HIGHEST_PROTOCOL)
+            # With a shared writer the languages can't be generated by worker processes.
+            if jobs > 1 and not shared_writer:
+                hashes |= _generate_languages_parallel(
+                    pickled_model, targets, version, jobs, incremental, template_engine, record_hashes
+                )
+            else:
+                for lang_pack, output_path in targets:
+                    with profiling.phase("deserialize_model"):
+                        class_dict, language_session = pickle.loads(pickled_model)
+                    hashes |= _generate_language(
+                        class_dict,
+                        language_session,
+                        lang_pack,
+                        output_path,
+                        version,
+                        jobs,
+                        incremental,
+                        template_engine,
+                        shared_writer,
+                        record_hashes,
+                    )
+    finally:
+        if isinstance(shared_writer, output_writer.ArchiveWriter):
+            shared_writer.close()
+
+    if record_hashes:
+        output_writer.write_manifest(manifest, root, hashes)
+    if isinstance(shared_writer, output_writer.CheckWriter):
+        return shared_writer.differences()
+    return None
+
+
+def _select_classes(
+    class_dict: dict[str, CIMComponentDefinition],
+    session: GenerationSession,
+    profiles: list[str] | None,
+    root_classes: list[str] | None,
+    follow_associations: bool,
+    pruning_report: Path | None,
+    lang_packs: list[ModuleType],
+) -> dict[str, CIMComponentDefinition]:
+    """Select the classes of some profiles and the classes reachable from some root classes, see cim_generate.
+
+    The classes required by the language packages (e.g. used by their static files) are always selected.
+
+    :return: Map of class name to class info of the selected classes including superclasses and subclasses.
+    """
+    required_classes = sorted({class_name for lang_pack in lang_packs for class_name in lang_pack.required_classes()})
+    if profiles:
+        with profiling.phase("select_profiles"):
+            class_dict = subset.select_profiles(class_dict, session, profiles, required_classes)
+            _add_class_hierarchy(class_dict)
+    if root_classes:
+        with profiling.phase("select_root_classes"):
+            class_dict, report = subset.select_root_classes(
+                class_dict, session, root_classes, follow_associations, required_classes
+            )
+            _add_class_hierarchy(class_dict)
+        if pruning_report:
+            subset.write_report(pruning_report, report)
+    if profiles or root_classes:
+        _check_used_namespaces(class_dict, session)
+    return class_dict
 
-        # parse RDF files and create a dictionary from the RDF file
-        parse_result = xmltodict.parse(xmlstring, attr_prefix="$", cdata_key="_", dict_constructor=dict)
-        parsed = _parse_rdf(parse_result, version)
+
+def _check_used_namespaces(class_dict: dict[str, CIMComponentDefinition], session: GenerationSession) -> None:
+    """Check that the namespaces of the selected classes, attributes and enum instances are still used namespaces.
+
+    Otherwise they would be missing in the namespace tables of the generated code.
+
+    :param class_dict: Map of class name to class info of the selected classes.
+    :param session:    Session of the generation run.
+    """
+    used_namespaces = set(session.get_used_namespaces().values())
+    for class_name, class_infos in class_dict.items():
+        namespaces = [class_infos.namespace]
+        namespaces += [attribute["namespace"] for attribute in class_infos.attributes()]
+        namespaces += [instance["namespace"] for instance in class_infos.enum_instances()]
+        missing = {session.get_namespace(namespace) for namespace in namespaces} - used_namespaces
+        if missing:
+            raise ValueError(
+                f"Namespaces {', '.join(sorted(missing))} of class '{class_name}' are missing in the used namespaces."
+            )
+
+
+def _generate_language(
+    class_dict: dict[str, CIMComponentDefinition],
+    session: GenerationSession,
+    lang_pack: ModuleType,
+    output_path: str,
+    version: str,
+    jobs: int,
+    incremental: bool,
+    template_engine: str,
+    shared_writer: output_writer.OutputWriter | None = None,
+    record_hashes: bool = False,
+) -> dict[Path, str]:
+    """Generate the files of one language from the merged classes.
+
+    :param class_dict:      Map of class name to merged class info, changed while writing the files.
+    :param session:         Session of the generation run, changed while writing the files.
+    :param lang_pack:       python module containing language specific functions
+    :param output_path:     The output directory
+    :param version:         CGMES version, e.g. version = "cgmes_v2_4_15"
+    :param jobs:            Number of worker processes used to render the class files (1: no worker processes)
+    :param incremental:     Write only files with changed content and remove only stale files
+    :param template_engine: Engine used to render the templates, see cim_generate
+    :param shared_writer:   Writer used for all languages, e.g. the writer of an archive
+                            (None: write into output_path with a new writer)
+    :param record_hashes:   Record the content hashes of the generated files
+    :return:                Map of the path of a generated file to its content hash (if recorded)
+    """
+    logger.info(f"Generate files with language package '{lang_pack.__name__}' in '{output_path}'.")
+    language = lang_pack.__name__.split(".")[-2]
+    with profiling.phase("generate", language=language):
+        writer = shared_writer or output_writer.OutputWriter(incremental, record_hashes)
+        renderer = rendering.Renderer(template_engine)
+        with output_writer.use_writer(writer), rendering.use_renderer(renderer):
+            # get information for writing language specific files and write these files
+            _write_all_files(class_dict, lang_pack, output_path, version, session, jobs)
+
+            with profiling.phase("resolve_headers"):
+                lang_pack.resolve_headers(output_path, version)
+
+            with profiling.phase("finish_writer"):
+                writer.finish()
+
+    renderer.log_statistics()
+    return writer.hashes or {}
+
+
+def cim_watch(
+    directory: Path,
+    targets: list[tuple[ModuleType, str]],
+    version: str,
+    jobs: int = 1,
+    template_engine: str = "compiled",
+    profiles: list[str] | None = None,
+    root_classes: list[str] | None = None,
+    follow_associations: bool = False,
+    interval: float = 1.0,
+) -> None:
+    """Generates cgmes classes and regenerates them whenever a schema file or a template changes
+
+    The files are generated once like with cim_generate_languages (in incremental mode), then the schema directory
+    and the template directories of the language packages are polled every interval seconds, until the process is
+    interrupted (Ctrl+C). The parsed schema files and the merged model are kept in memory:
+      - If schema files have changed, only these files are parsed again, then all files are merged again and all
+        languages are generated again (only files with changed content are written).
+      - If templates of a language package have changed, only the files rendered with these templates are rendered
+        again. If another file in the template directory has changed, the language is generated again.
+      - Errors of a generation (e.g. of a schema file or template saved while editing) are logged, the watch mode
+        continues and generates the files again after the next change.
+
+    :param directory:   path to RDF files containing cgmes ontology, see cim_generate
+    :param targets:     List of the language packages and their output directories
+    :param version:     CGMES version, e.g. version = "cgmes_v2_4_15"
+    :param jobs:        Number of worker processes used to render the class files (1: no worker processes)
+    :param template_engine: Engine used to render the templates, see cim_generate
+    :param profiles:    Short names of the profiles to generate, see cim_generate (None: all profiles)
+    :param root_classes: Names of the classes to generate, see cim_generate (None: all classes)
+    :param follow_associations: Generate also the classes of associations of the root classes (and so on)
+    :param interval:    Seconds between two checks for changed files
+    """
+    parsed_files: dict[Path, tuple[int, bytes]] = {}  # file -> modification time and serialized parse result
+    template_states = {
+        output_path: _get_file_states(_get_template_dir(lang_pack)) for lang_pack, output_path in targets
+    }
+
+    def generate_all() -> tuple[bytes, dict[str, rendering.RenderLog]]:
+        t0 = time()
+        files = _get_schema_files(directory)
+        class_dict, session = _merge_parsed_files(files, parsed_files, version)
+        class_dict = _select_classes(
+            class_dict,
+            session,
+            profiles,
+            root_classes,
+            follow_associations,
+            None,
+            [lang_pack for lang_pack, _ in targets],
+        )
+        model = pickle.dumps((class_dict, session), protocol=pickle.HIGHEST_PROTOCOL)
+        logs = {
+            output_path: _generate_watched_language(model, lang_pack, output_path, version, jobs, template_engine)
+            for lang_pack, output_path in targets
+        }
+        logger.info(f"Generated {len(targets)} language(s) from {len(files)} schema files in {time() - t0:.2f}s.")
+        return model, logs
+
+    schema_states: dict[Path, int] | None = None
+    model: bytes | None = None  # None if the last generation of all languages has failed
+    logs: dict[str, rendering.RenderLog] = {}
+    logger.info(f"Watching '{directory}' and the templates for changes (Ctrl+C to stop).")
+    try:
+        while True:
+            changed_templates: dict[str, list[str]] = {}
+            for lang_pack, output_path in targets:
+                template_dir = _get_template_dir(lang_pack)
+                states = _get_file_states(template_dir)
+                changed_templates[output_path] = sorted(
+                    file.relative_to(template_dir).as_posix()
+                    for file in states.keys() | template_states[output_path].keys()
+                    if states.get(file) != template_states[output_path].get(file)
+                )
+                template_states[output_path] = states
+            states = _get_file_states(directory, "*.rdf")
+            # Errors (e.g. a half written schema file or template) are logged and the files are generated again
+            # after the next change, so that the watch mode survives saving an unfinished file.
+            if states != schema_states or (model is None and any(changed_templates.values())):
+                schema_states = states
+                for lang_pack, output_path in targets:
+                    if changed_templates[output_path]:
+                        rendering.registry.invalidate(_get_template_package(lang_pack))
+                model, logs = None, {}
+                try:
+                    model, logs = generate_all()
+                except Exception:
+                    logger.exception("Generation failed, waiting for the next change.")
+            elif model is not None:
+                for lang_pack, output_path in targets:
+                    changed = changed_templates[output_path]
+                    if not changed:
+                        continue
+                    t0 = time()
+                    template_package = _get_template_package(lang_pack)
+                    try:
+                        if all((template_package, name) in logs[output_path] for name in changed):
+                            for name in changed:
+                                rendering.registry.invalidate(template_package, name)
+                            count = 0
+                            with (
+                                output_writer.use_writer(output_writer.OutputWriter(incremental=True)),
+                                rendering.use_renderer(rendering.Renderer(template_engine)),
+                            ):
+                                for name in changed:
+                                    count += rendering.render_again(logs[output_path], template_package, name)
+                            logger.info(f"Rendered {count} files of {', '.join(changed)} again in {time() - t0:.2f}s.")
+                        else:
+                            rendering.registry.invalidate(template_package)
+                            logs[output_path] = _generate_watched_language(
+                                model, lang_pack, output_path, version, jobs, template_engine
+                            )
+                            logger.info(f"Generated '{output_path}' again in {time() - t0:.2f}s.")
+                    except Exception:
+                        logger.exception(f"Generation of '{output_path}' failed, waiting for the next change.")
+            sleep(interval)
+    except KeyboardInterrupt:
+        logger.info("Watch mode stopped.")
+
+
+def _get_schema_files(directory: Path) -> list[Path]:
+    # RDF files: first in the main directory, than in subdirectories
+    files = sorted(directory.glob("*.rdf")) + sorted(directory.glob("*/**/*.rdf"))
+    if not files:
+        # Don't report a successful generation without any classes
+        raise FileNotFoundError(f"No schema files (*.rdf) found in '{directory}'.")
+    return files
+
+
+def _get_template_dir(lang_pack: ModuleType) -> Path:
+    return Path(lang_pack.__file__).parent / "templates"
+
+
+def _get_template_package(lang_pack: ModuleType) -> str:
+    return lang_pack.__name__.rsplit(".", 1)[0] + ".templates"
+
+
+def _get_file_states(directory: Path, pattern: str = "*") -> dict[Path, int]:
+    # Modification times of the files, used to detect changed, new and removed files
+    return {file: file.stat().st_mtime_ns for file in directory.rglob(pattern) if file.is_file()}
+
+
+def _merge_parsed_files(
+    files: list[Path], parsed_files: dict[Path, tuple[int, bytes]], version: str
+) -> tuple[dict[str, CIMComponentDefinition], GenerationSession]:
+    """Parse the new and changed RDF files and merge the classes of all files.
+
+    The parse results are kept serialized, because merging changes the parsed classes.
+
+    :param files:        Paths to the RDF files.
+    :param parsed_files: Map of the RDF files to their modification time and serialized parse result,
+                         updated for new, changed and removed files.
+    :param version:      CGMES version, e.g. version = "cgmes_v2_4_15"
+    :return:             Map of class name to merged class info including superclasses and subclasses, and the session.
+    """
+    for file in list(parsed_files):
+        if file not in files:
+            del parsed_files[file]
+    with profiling.phase("parse"):
+        for file in files:
+            state = file.stat().st_mtime_ns
+            if file not in parsed_files or parsed_files[file][0] != state:
+                parsed = _parse_rdf_in_worker(file, version)
+                parsed_files[file] = (state, pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+    session = GenerationSession()
+    profiles_array = []
+    for file in files:
+        parsed, file_session = pickle.loads(parsed_files[file][1])
+        session.merge(file_session)
         profiles_array.append(parsed)
+    with profiling.phase("merge_profiles_and_classes"):
+        class_dict = _merge_profiles_and_classes(profiles_array, session)
+    with profiling.phase("class_hierarchy"):
+        _add_class_hierarchy(class_dict)
+    return class_dict, session
+
+
+def _generate_watched_language(
+    pickled_model: bytes, lang_pack: ModuleType, output_path: str, version: str, jobs: int, template_engine: str
+) -> rendering.RenderLog:
+    """Generate the files of one language in incremental mode and record the renders, see _generate_language.
+
+    :param pickled_model: Serialized merged classes and session.
+    :return:              Recorded renders, used to render the files of a changed template again.
+    """
+    class_dict, session = pickle.loads(pickled_model)
+    with rendering.record_renders() as log:
+        _generate_language(class_dict, session, lang_pack, output_path, version, jobs, True, template_engine)
+    return log
+
+
+def _generate_language_in_worker(
+    pickled_model: bytes,
+    lang_pack_name: str,
+    output_path: str,
+    version: str,
+    jobs: int,
+    incremental: bool,
+    template_engine: str,
+    record_hashes: bool,
+) -> dict[Path, str]:
+    """Generate the files of one language in a worker process, see _generate_language.
+
+    :param pickled_model:  Serialized merged classes and session.
+    :param lang_pack_name: Name of the python module containing language specific functions.
+    """
+    with profiling.phase("deserialize_model"):
+        class_dict, session = pickle.loads(pickled_model)
+    lang_pack = importlib.import_module(lang_pack_name)
+    return _generate_language(
+        class_dict, session, lang_pack, output_path, version, jobs, incremental, template_engine, None, record_hashes
+    )
+
+
+def _generate_languages_parallel(
+    pickled_model: bytes,
+    targets: list[tuple[ModuleType, str]],
+    version: str,
+    jobs: int,
+    incremental: bool,
+    template_engine: str,
+    record_hashes: bool,
+) -> dict[Path, str]:
+    """Generate the files of several languages in worker processes.
+
+    Each language is generated by one worker process, the remaining jobs are used to render the class files.
+
+    :param pickled_model: Serialized merged classes and session.
+    :param targets:       List of the language packages and their output directories.
+    :param version:       CGMES version, e.g. version = "cgmes_v2_4_15"
+    :param jobs:          Number of worker processes.
+    :param incremental:   Write only files with changed content and remove only stale files
+    :param template_engine: Engine used to render the templates, see cim_generate
+    :param record_hashes: Record the content hashes of the generated files
+    :return:              Map of the path of a generated file to its content hash (if recorded)
+    """
+    hashes: dict[Path, str] = {}
+    workers = min(jobs, len(targets))
+    render_jobs = max(1, jobs // workers)
+    profile_settings = profiling.get_worker_settings()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                profiling.run_in_worker,
+                profile_settings,
+                _generate_language_in_worker,
+                pickled_model,
+                lang_pack.__name__,
+                output_path,
+                version,
+                render_jobs,
+                incremental,
+                template_engine,
+                record_hashes,
+            )
+            for lang_pack, output_path in targets
+        ]
+        for future in futures:
+            # raise the exceptions of the workers
+            language_hashes, profile_data = future.result()
+            profiling.merge_worker_data(profile_data, worker=True)
+            hashes |= language_hashes
+    return hashes
+
+
+def _build_class_dict(
+    files: list[Path], version: str, jobs: int, session: GenerationSession
+) -> dict[str, CIMComponentDefinition]:
+    """Parse the RDF files and merge the classes of all profiles.
+
+    :param files:   Paths to the RDF files.
+    :param version: CGMES version, e.g. version = "cgmes_v2_4_15"
+    :param jobs:    Number of worker processes used to parse the RDF files (1: no worker processes)
+    :param session: Session of the generation run, collects the namespaces, profile names and profile uris
+    :return:        Map of class name to merged class info including superclasses and subclasses.
+    """
+    with profiling.phase("parse"):
+        if jobs > 1 and len(files) > 1:
+            profiles_array = _parse_rdf_files_parallel(files, version, jobs, session)
+        else:
+            profiles_array = []
+            for file in files:
+                logger.info(f"Start of parsing file '{file}'.")
+
+                # parse RDF file description by description and sort the classes to the profile
+                with profiling.phase("parse_rdf", file=str(file)):
+                    parsed = _parse_rdf(file, version, session)
+                profiles_array.append(parsed)
 
     # merge classes from different profiles into one class and track origin of the classes and their attributes
-    class_dict_with_origins = _merge_profiles_and_classes(profiles_array)
+    with profiling.phase("merge_profiles_and_classes"):
+        class_dict_with_origins = _merge_profiles_and_classes(profiles_array, session)
 
-    # recursively add the superclasses of superclasses and the subclasses of subclasses
-    _add_superclasses_of_superclasses(class_dict_with_origins)
-    _add_subclasses_of_subclasses(class_dict_with_origins)
+    with profiling.phase("class_hierarchy"):
+        _add_class_hierarchy(class_dict_with_origins)
+    return class_dict_with_origins
 
-    # get information for writing language specific files and write these files
-    _write_all_files(class_dict_with_origins, lang_pack, output_path, version)
 
-    lang_pack.resolve_headers(output_path, version)
+def _add_class_hierarchy(class_dict: dict[str, CIMComponentDefinition]) -> None:
+    """Add the superclasses of superclasses and the subclasses of subclasses to all classes.
 
-    logger.info(f"Elapsed Time: {time() - t0}s")
+    :param class_dict: Map of class name to merged class info.
+    """
+    hierarchy = ClassHierarchy(class_dict)
+    _add_superclasses_of_superclasses(class_dict, hierarchy)
+    _add_subclasses_of_subclasses(class_dict, hierarchy)
 
 
-def _get_profile_details(cgmes_profile_uris: dict[str, list[str]]) -> list[dict]:
+def _get_profile_details(session: GenerationSession) -> list[dict]:
+    cgmes_profile_uris = session.package_listed_by_short_name
     profile_details: list[dict] = []
     sorted_profile_keys = _get_sorted_profile_keys(list(cgmes_profile_uris.keys()))
     for index, profile in enumerate(sorted_profile_keys):
         profile_info = {
             "index": index,
             "short_name": profile,
-            "long_name": long_profile_names[profile],
+            "long_name": session.long_profile_names[profile],
             "uris": [{"uri": uri} for uri in cgmes_profile_uris[profile]],
         }
         profile_details.append(profile_info)
@@ -693,7 +1864,9 @@ def _get_sorted_profile_keys(profile_key_list: list[str]) -> list[str]:
     return sorted(profile_key_list, key=lambda p: "0" if p == "EQ" else p)
 
 
-def _get_recommended_class_profiles(elem_dict: dict[str, CIMComponentDefinition]) -> dict[str, str]:
+def _get_recommended_class_profiles(
+    elem_dict: dict[str, CIMComponentDefinition], hierarchy: ClassHierarchy
+) -> dict[str, str]:
     """Get the recommended profiles for all classes.
 
     This function searches for the recommended profile of each class.
@@ -707,6 +1880,7 @@ def _get_recommended_class_profiles(elem_dict: dict[str, CIMComponentDefinition]
                       Used are here possible class profiles (elem_dict[class_name].origins()),
                       possible attribute profiles (elem_dict[class_name].attributes()[*]["attr_origin"])
                       and the superclass of each class (elem_dict[class_name].subclass_of()).
+    :param hierarchy: Class hierarchy of elem_dict, used for the attributes of the superclasses.
     :return:          Mapping of class to profile.
     """
     recommended_class_profiles: dict[str, str] = {}
@@ -718,16 +1892,13 @@ def _get_recommended_class_profiles(elem_dict: dict[str, CIMComponentDefinition]
 
         # Count profiles of all attributes of this class and its superclasses
         profile_count_map = {}
-        name = class_name
-        while name:
-            for attribute in elem_dict[name].attributes():
-                profiles = attribute["attr_origin"]
-                ambiguous_profile = len(profiles) > 1
-                for profile in profiles:
-                    # Use condition attribute["is_used"]? For CGMES 2.4.13/2.4.15/3.0.0 the results wouldn't change!
-                    if ambiguous_profile and profile in class_profiles:
-                        profile_count_map.setdefault(profile, []).append(attribute["label"])
-            name = elem_dict[name].subclass_of()
+        for attribute in hierarchy.inherited_attributes(class_name):
+            profiles = attribute["attr_origin"]
+            ambiguous_profile = len(profiles) > 1
+            for profile in profiles:
+                # Use condition attribute["is_used"]? For CGMES 2.4.13/2.4.15/3.0.0 the results wouldn't change!
+                if ambiguous_profile and profile in class_profiles:
+                    profile_count_map.setdefault(profile, []).append(attribute["label"])
 
         # Set the profile with most attributes as recommended profile for this class
         if profile_count_map:
@@ -768,14 +1939,6 @@ def _get_attribute_type(attribute: dict, class_infos: CIMComponentDefinition) ->
     return attribute_type
 
 
-def _get_namespace(parsed_namespace: str) -> str:
-    if parsed_namespace == "#":
-        namespace = all_namespaces["cim"]
-    else:
-        namespace = parsed_namespace
-    return namespace
-
-
 def _get_bool_string(bool_value: bool) -> str:
     """Convert boolean value into a string which is usable in both Python and Json.
 
@@ -801,83 +1964,26 @@ def _is_attribute_with_inverse_list(attribute: dict, elem_dict: dict[str, CIMCom
     """
     if "inverse_role" in attribute:
         inverse_class, inverse_label = attribute["inverse_role"].split(".")
-        for inverse_attribute in elem_dict[inverse_class].attributes():
-            if inverse_attribute["label"] == inverse_label:
-                attribute_class = _get_attribute_class(inverse_attribute)
-                attribute_type = _get_attribute_type(inverse_attribute, elem_dict[attribute_class])
-                return attribute_type == "list"
+        inverse_attribute = elem_dict[inverse_class].attribute(inverse_label)
+        if inverse_attribute:
+            attribute_class = _get_attribute_class(inverse_attribute)
+            attribute_type = _get_attribute_type(inverse_attribute, elem_dict[attribute_class])
+            return attribute_type == "list"
     return False
 
 
-def _parse_namespaces(namespace_dict: dict) -> None:
-    """Parse the namespaces of the rdf file and save these in the global dictionary all_namespaces.
-
-    If two rdf files contain the same namespace url with different keys only the first key is saved.
-    If two rdf files contain the same namespace key with different urls the second url is saved with key ns0, ns1, etc.
-
-    :param namespace_dict: Dictionary which contains the namespace urls with keys "$xmlns:<ns>".
-    """
-    global all_namespaces
-    for k, v in namespace_dict.items():
-        if k.startswith("$xmlns:"):
-            ns = k.split(":")[1]
-            url = v if v.endswith("#") else v + "#"
-            if url not in all_namespaces.values():
-                if ns in all_namespaces:
-                    used = True
-                    idx = 0
-                    while used:
-                        ns = f"ns{idx}"
-                        if ns not in all_namespaces:
-                            used = False
-                        idx += 1
-                all_namespaces[ns] = url
-
-
-def _add_to_used_namespaces(namespace_url: str) -> None:
-    """Add a namespace url to the global list used_namespaces.
-
-    :param namespace_url: URL to add to used_namespaces.
-    """
-    global used_namespaces
-    if namespace_url != "#" and namespace_url not in used_namespaces:
-        used_namespaces.append(namespace_url)
-
-
-def _get_used_namespaces() -> dict[str, str]:
-    """Construct a dictionary with the namespaces of the global list used_namespaces using keys from all_namespaces.
-
-    If a namespace url is not found in all_namespaces it will be added to all_namespaces with key ns0, ns1, etc.
-
-    :return: Dictionary of used namespaces.
-    """
-    global all_namespaces
-    for url in used_namespaces:
-        if url not in all_namespaces.values():
-            used = True
-            idx = 0
-            while used:
-                ns = f"ns{idx}"
-                if ns not in all_namespaces:
-                    used = False
-                idx += 1
-            all_namespaces[ns] = url
-    namespaces = {}
-    for ns, url in all_namespaces.items():
-        if ns in ("rdf", "md", "cim") or url in used_namespaces:
-            namespaces[ns] = url
-    return namespaces
-
-
-def _check_attribute_for_class(classes_map: dict[str, CIMComponentDefinition], attribute: dict) -> bool:
+def _check_attribute_for_class(
+    classes_map: dict[str, CIMComponentDefinition], attribute: dict, session: GenerationSession
+) -> bool:
     """Check if the attribute could be added to the corresponding class.
 
     :param classes_map: Information about all classes.
     :param attribute:   Dictionary with information about an attribute of a class.
+    :param session:     Session of the generation run.
     :return:            Is the attribute okay?
     """
     # Exclude ModelDescription and DifferenceModel definitions
-    if attribute["namespace"] in (all_namespaces.get("md"), all_namespaces.get("dm")):
+    if session.is_excluded_namespace(attribute["namespace"]):
         return False
     about = attribute["about"]
     domain = attribute["domain"]
@@ -903,38 +2009,39 @@ def _check_inverse_role(attribute: dict, elem_dict: dict[str, CIMComponentDefini
     if "inverse_role" in attribute:
         inverse_role = attribute["inverse_role"]
         inverse_class, inverse_label = inverse_role.split(".")
-        for inverse_attribute in elem_dict[inverse_class].attributes():
-            if inverse_attribute["label"] == inverse_label:
-                if attribute["is_used"] and inverse_attribute["is_used"]:
-                    logger.warning(f"Both sides used for attribute '{about}' with inverse role '{inverse_role}'.")
-                    ok = False
-                elif not attribute["is_used"] and not inverse_attribute["is_used"]:
-                    logger.error(f"No side used for attribute '{about}' with inverse role '{inverse_role}'.")
-                    ok = False
-                inverse_inverse_role = inverse_attribute.get("inverse_role", "")
-                if inverse_inverse_role != about:
-                    logger.error(
-                        f"Wrong inverse role of inverse role for attribute '{about}': '{inverse_inverse_role}'."
-                    )
-                    ok = False
+        inverse_attribute = elem_dict[inverse_class].attribute(inverse_label)
+        if inverse_attribute:
+            if attribute["is_used"] and inverse_attribute["is_used"]:
+                logger.warning(f"Both sides used for attribute '{about}' with inverse role '{inverse_role}'.")
+                ok = False
+            elif not attribute["is_used"] and not inverse_attribute["is_used"]:
+                logger.error(f"No side used for attribute '{about}' with inverse role '{inverse_role}'.")
+                ok = False
+            inverse_inverse_role = inverse_attribute.get("inverse_role", "")
+            if inverse_inverse_role != about:
+                logger.error(f"Wrong inverse role of inverse role for attribute '{about}': '{inverse_inverse_role}'.")
+                ok = False
     elif not attribute["is_used"]:
         logger.error(f"Attribute '{about}' not used, but has no inverse role.")
         ok = False
     return ok
 
 
-def _check_merge_class(class_infos: CIMComponentDefinition, new_class_infos: CIMComponentDefinition) -> None:
+def _check_merge_class(
+    class_infos: CIMComponentDefinition, new_class_infos: CIMComponentDefinition, session: GenerationSession
+) -> None:
     """Check if there are differences after merging class infos.
 
     :param class_infos:     Information about a class.
     :param new_class_infos: Merged information about a class.
+    :param session:         Session of the generation run.
     """
     if class_infos.superclass != new_class_infos.superclass and new_class_infos.superclass:
         logger.error(
             "Different superclass for class"
             + f" '{class_infos.about}': '{class_infos.superclass}' != '{new_class_infos.superclass}'."
         )
-    if _get_namespace(class_infos.namespace) != _get_namespace(new_class_infos.namespace):
+    if session.get_namespace(class_infos.namespace) != session.get_namespace(new_class_infos.namespace):
         logger.error(
             "Different namespace for class"
             + f" '{class_infos.about}': '{class_infos.namespace}' != '{new_class_infos.namespace}'."
@@ -1,8 +1,7 @@
-import shutil
-from importlib.resources import files
+from contextvars import ContextVar
 from pathlib import Path
 
-import chevron
+from cimgen import output_writer, rendering
 
 
 # Setup called only once: make output directory, create base class, create profile class, etc.
@@ -12,13 +11,12 @@ import chevron
 def setup(output_path: str, version: str, cgmes_profile_details: list[dict], namespaces: dict[str, str]) -> None:
     source_dir = Path(__file__).parent
     dest_dir = Path(output_path)
-    for file in dest_dir.glob("**/*.[ch]*"):
-        file.unlink()
+    output_writer.remove_generated(dest_dir, "**/*.[ch]*")
+    _defined_classes.set(set())
     # Add all hardcoded utils and create parent dir
     for file in source_dir.glob("static/*.[ch]*"):
         dest_file = dest_dir / file.relative_to(source_dir)
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy(file, dest_file)
+        output_writer.copy_file(file, dest_file)
     _create_constants(dest_dir, version, namespaces)
     _create_cgmes_profile(dest_dir, cgmes_profile_details)
 
@@ -56,6 +54,18 @@ iec61970_template = {"filename": "cpp_iec61970_template.mustache", "ext": ".hpp"
 
 partials = {}
 
+# Classes with a BaseClassDefiner (rendered with template_files), registered by run_template.
+# Primitive, datatype and enum classes are not registered. Used by resolve_headers for the include files.
+# The set is created by setup for each generation run, so concurrent runs (e.g. in threads) don't mix their classes.
+_defined_classes: ContextVar[set[str]] = ContextVar("defined_classes")
+
+
+def _get_defined_classes() -> set[str]:
+    try:
+        return _defined_classes.get()
+    except LookupError:
+        raise RuntimeError("setup() must be called first to start the generation run.") from None
+
 
 def get_base_class() -> str:
     return "BaseClass"
@@ -65,6 +75,10 @@ def get_class_location(class_name: str, class_map: dict, version: str) -> str:
     return ""
 
 
+def required_classes() -> list[str]:
+    return []
+
+
 # This is the function that runs the template.
 def run_template(output_path: str, class_details: dict) -> None:
     # Add some class infos
@@ -94,22 +108,18 @@ def run_template(output_path: str, class_details: dict) -> None:
         # We have to implement operators for them
         return
 
+    if templates is template_files:
+        _get_defined_classes().add(class_details["class_name"])
+
     for template_info in templates:
         class_file = Path(output_path) / (class_details["class_name"] + template_info["ext"])
         _write_templated_file(class_file, class_details, template_info["filename"])
 
 
 def _write_templated_file(class_file: Path, class_details: dict, template_filename: str) -> None:
-    with class_file.open("w", encoding="utf-8") as file:
-        templates = files("cimgen.languages.cpp.templates")
-        with templates.joinpath(template_filename).open(encoding="utf-8") as f:
-            args = {
-                "data": class_details,
-                "template": f,
-                "partials_dict": partials,
-            }
-            output = chevron.render(**args)
-        file.write(output)
+    rendering.write_templated_file(
+        class_file, "cimgen.languages.cpp.templates", template_filename, class_details, partials
+    )
 
 
 def _create_constants(output_path: Path, version: str, namespaces: dict[str, str]) -> None:
@@ -233,25 +243,10 @@ class_blacklist = [
 iec61970_blacklist = ["CIMClassList", "CIMNamespaces", "CimConstants", "Folders", "Task", "IEC61970"]
 
 
-def _is_primitive_or_enum_class(file: Path) -> bool:
-    with file.open(encoding="utf-8") as f:
-        try:
-            for line in f:
-                if "static const BaseClassDefiner declare();" in line:
-                    return False
-        except UnicodeDecodeError as error:
-            print("Warning: UnicodeDecodeError parsing {0}: {1}".format(file.name, error))
-    return True
-
-
 def _create_header_include_file(
     directory: Path, header_include_filename: str, template_info: dict[str, str], blacklist: list[str]
 ) -> None:
-    classes = []
-    for file in sorted(directory.glob("*.hpp"), key=lambda f: f.stem):
-        class_name = file.stem
-        if not _is_primitive_or_enum_class(file) and class_name not in blacklist:
-            classes.append(class_name)
+    classes = [class_name for class_name in sorted(_get_defined_classes()) if class_name not in blacklist]
     path = directory / (header_include_filename + template_info["ext"])
     _write_templated_file(path, {"classes": classes}, template_info["filename"])
 
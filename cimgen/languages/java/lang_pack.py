@@ -1,9 +1,7 @@
 import logging
-import shutil
-from importlib.resources import files
 from pathlib import Path
 
-import chevron
+from cimgen import output_writer, rendering
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +13,11 @@ logger = logging.getLogger(__name__)
 def setup(output_path: str, version: str, cgmes_profile_details: list[dict], namespaces: dict[str, str]) -> None:
     source_dir = Path(__file__).parent
     dest_dir = Path(output_path)
-    for file in dest_dir.glob("**/*.java"):
-        file.unlink()
+    output_writer.remove_generated(dest_dir, "**/*.java")
     # Add all hardcoded utils and create parent dir
     for file in source_dir.glob("**/*.java"):
         dest_file = dest_dir / file.relative_to(source_dir)
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy(file, dest_file)
+        output_writer.copy_file(file, dest_file)
     _create_constants(dest_dir, version, namespaces)
     _create_cgmes_profile(dest_dir, cgmes_profile_details)
 
@@ -42,6 +38,10 @@ def get_class_location(class_name: str, class_map: dict, version: str) -> str:
     return ""
 
 
+def required_classes() -> list[str]:
+    return []
+
+
 # This is the function that runs the template.
 def run_template(output_path: str, class_details: dict) -> None:
     # Add some attribute infos
@@ -77,16 +77,7 @@ def run_template(output_path: str, class_details: dict) -> None:
 
 
 def _write_templated_file(class_file: Path, class_details: dict, template_filename: str) -> None:
-    class_file.parent.mkdir(parents=True, exist_ok=True)
-    with class_file.open("w", encoding="utf-8") as file:
-        templates = files("cimgen.languages.java.templates")
-        with templates.joinpath(template_filename).open(encoding="utf-8") as f:
-            args = {
-                "data": class_details,
-                "template": f,
-            }
-            output = chevron.render(**args)
-        file.write(output)
+    rendering.write_templated_file(class_file, "cimgen.languages.java.templates", template_filename, class_details)
 
 
 def _create_constants(output_path: Path, version: str, namespaces: dict[str, str]) -> None:
@@ -160,7 +151,7 @@ def resolve_headers(path: str, version: str) -> None:  # NOSONAR
     directory = Path(path)
     classlist_file = directory / ("CimClassMap" + classlist_template_file["ext"])
     classes = []
-    for file in sorted(directory.glob("*.java"), key=lambda f: f.stem):
+    for file in sorted(output_writer.generated_files(directory, "*.java"), key=lambda f: f.stem):
         class_name = file.stem
         if class_name not in class_blacklist:
             classes.append(class_name)
@@ -1,8 +1,8 @@
 import os
 import sys
-from importlib.resources import files
+from pathlib import Path
 
-import chevron
+from cimgen import output_writer, rendering
 
 
 # Setup called only once: make output directory, create base class, create profile class, etc.
@@ -10,11 +10,7 @@ import chevron
 # cgmes_profile_details contains index, names and uris for each profile.
 # We use that to create the header data for the profiles.
 def setup(output_path: str, version: str, cgmes_profile_details: list[dict], namespaces: dict[str, str]) -> None:
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-    else:
-        for filename in os.listdir(output_path):
-            os.remove(os.path.join(output_path, filename))
+    output_writer.remove_generated(Path(output_path), "*")
     _create_base(output_path)
     _create_constants(output_path, version, namespaces)
     _create_cgmes_profile(output_path, cgmes_profile_details)
@@ -99,6 +95,10 @@ def get_class_location(class_name: str, class_map: dict, version: str) -> str:
     return ""
 
 
+def required_classes() -> list[str]:
+    return []
+
+
 # This is the function that runs the template.
 def run_template(output_path: str, class_details: dict) -> None:
     if class_details["class_name"] == "String":
@@ -124,16 +124,9 @@ def run_template(output_path: str, class_details: dict) -> None:
 
 
 def _write_templated_file(class_file: str, class_details: dict, template_filename: str) -> None:
-    with open(class_file, "w", encoding="utf-8") as file:
-        templates = files("cimgen.languages.javascript.templates")
-        with templates.joinpath(template_filename).open(encoding="utf-8") as f:
-            args = {
-                "data": class_details,
-                "template": f,
-                "partials_dict": partials,
-            }
-            output = chevron.render(**args)
-        file.write(output)
+    rendering.write_templated_file(
+        class_file, "cimgen.languages.javascript.templates", template_filename, class_details, partials
+    )
 
 
 # creates the Base class file, all classes inherit from this class
@@ -1,10 +1,8 @@
 import logging
 import re
-import shutil
-from importlib.resources import files
 from pathlib import Path
 
-import chevron
+from cimgen import output_writer, rendering
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +15,11 @@ logger = logging.getLogger(__name__)
 def setup(output_path: str, version: str, cgmes_profile_details: list[dict], namespaces: dict[str, str]) -> None:
     source_dir = Path(__file__).parent
     dest_dir = Path(output_path)
-    for file in dest_dir.glob("**/*.[mp]*"):
-        file.unlink()
+    output_writer.remove_generated(dest_dir, "**/*.[mp]*")
     # Add all hardcoded utils and create parent dir
     for file in source_dir.glob("utils/*.[mp]*"):
         dest_file = dest_dir / file.relative_to(source_dir)
-        dest_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy(file, dest_file)
+        output_writer.copy_file(file, dest_file)
     _create_constants(dest_dir, version, namespaces)
     _create_cgmes_profile(dest_dir, cgmes_profile_details)
 
@@ -83,6 +79,11 @@ def get_class_location(class_name: str, class_map: dict, version: str) -> str:
     return "..utils.base"
 
 
+def required_classes() -> list[str]:
+    # Classes imported by the static utils (datatypes.py), generated even if no selected class uses them
+    return ["Currency", "UnitMultiplier", "UnitSymbol"]
+
+
 def run_template(output_path: str, class_details: dict) -> None:
     # Add some attribute infos
     for attribute in class_details["attributes"]:
@@ -118,21 +119,13 @@ def run_template(output_path: str, class_details: dict) -> None:
 
 def _create_file(output_path: str, class_details: dict, template: dict[str, str]) -> Path:
     resource_file = Path(output_path) / "resources" / (class_details["class_name"] + template["ext"])
-    resource_file.parent.mkdir(exist_ok=True)
     return resource_file
 
 
 def _write_templated_file(class_file: Path, class_details: dict, template_filename: str) -> None:
-    with class_file.open("w", encoding="utf-8") as file:
-        templates = files("cimgen.languages.modernpython.templates")
-        with templates.joinpath(template_filename).open(encoding="utf-8") as f:
-            args = {
-                "data": class_details,
-                "template": f,
-                "partials_dict": partials,
-            }
-            output = chevron.render(**args)
-        file.write(output)
+    rendering.write_templated_file(
+        class_file, "cimgen.languages.modernpython.templates", template_filename, class_details, partials
+    )
 
 
 def _create_constants(output_path: Path, version: str, namespaces: dict[str, str]) -> None:
@@ -185,28 +178,26 @@ def resolve_headers(path: str, version: str) -> None:
     dest = Path(path) / "resources"
     with open(src / "__init__.py", "r", encoding="utf-8") as template_file:
         template_text = template_file.read()
-    with open(dest / "__init__.py", "a", encoding="utf-8") as header_file:
-        header_file.write(template_text)
-        header_file.write(f'\nCGMES_VERSION = "{version_number}"\n')
-
-        # # Under this, add all imports in init. Disabled becasue loading 600 unneeded classes is slow.
-        # _all = ["CGMES_VERSION"]
-
-        # for include_name in sorted(dest.glob("*.py")):
-        #     stem = include_name.stem
-        #     if stem in[ "__init__", "Base"]:
-        #         continue
-        #     _all.append(stem)
-        #     header_file.write(f"from .{stem} import {stem}\n")
-
-        # header_file.write(
-        #     "\n".join(
-        #         [
-        #             "# This is not needed per se, but by referencing all imports",
-        #             "# this prevents a potential autoflake from cleaning up the whole file.",
-        #             "# FYA, if __all__ is present, only what's in there will be import with a import *",
-        #             "",
-        #         ]
-        #     )
-        # )
-        # header_file.write(f"__all__={_all}")
+    output_writer.write_text(dest / "__init__.py", template_text + f'\nCGMES_VERSION = "{version_number}"\n')
+
+    # # Under this, add all imports in init. Disabled becasue loading 600 unneeded classes is slow.
+    # _all = ["CGMES_VERSION"]
+
+    # for include_name in sorted(dest.glob("*.py")):
+    #     stem = include_name.stem
+    #     if stem in[ "__init__", "Base"]:
+    #         continue
+    #     _all.append(stem)
+    #     header_file.write(f"from .{stem} import {stem}\n")
+
+    # header_file.write(
+    #     "\n".join(
+    #         [
+    #             "# This is not needed per se, but by referencing all imports",
+    #             "# this prevents a potential autoflake from cleaning up the whole file.",
+    #             "# FYA, if __all__ is present, only what's in there will be import with a import *",
+    #             "",
+    #         ]
+    #     )
+    # )
+    # header_file.write(f"__all__={_all}")
@@ -1,6 +1,8 @@
 import importlib
+from collections.abc import Mapping
 from dataclasses import Field, fields
-from functools import cached_property
+from functools import cache, cached_property
+from types import MappingProxyType
 from typing import Any, TypeAlias, TypedDict
 
 from pydantic.dataclasses import dataclass
@@ -33,12 +35,14 @@ class Base:
         """
         raise NotImplementedError("Method not implemented because not relevant in Base.")
 
-    @cached_property
-    def possible_attribute_profiles(self) -> dict[str, list[BaseProfile]]:
+    @property
+    def possible_attribute_profiles(self) -> Mapping[str, list[BaseProfile]]:
         """
         Mapping of attribute to the list of possible profiles.
+
+        The mapping is computed once per class and shared by all instances, it must not be modified.
         """
-        return {f.name: Base.get_extra_prop(f, "in_profiles") for f in fields(self)}
+        return self._attribute_profiles_of_class()
 
     @staticmethod
     def parse_json_as(attrs: dict[str, Any]) -> "Base":
@@ -103,13 +107,7 @@ class Base:
 
         If profile is None, returns all.
         """
-        return {
-            f
-            for f in fields(self)
-            if profile is None or (profile in Base.get_extra_prop(f, "in_profiles"))
-            if f.name != "mRID"
-            if Base.get_extra_prop(f, "is_used")
-        }
+        return set(self._fields_in_profile(profile))
 
     def cgmes_attributes_in_profile(self, profile: BaseProfile | None) -> dict[str, "CgmesAttribute"]:
         """
@@ -121,17 +119,51 @@ class Base:
         <cim:IdentifiedObject.name>3022308-EL-M01-145-SC3</cim:IdentifiedObject.name>
         with thus the parent class included in the attribute name.
         """
+        return {
+            qualname: CgmesAttribute(
+                value=getattr(self, shortname), namespace=self.namespace if namespace is None else namespace
+            )
+            for qualname, shortname, namespace in self._qualified_attributes_in_profile(profile)
+        }
+
+    # The following tables depend only on the class, they are computed on first use and cached per class and profile,
+    # so the attribute and profile queries of the instances are simple lookups.
+
+    @classmethod
+    @cache
+    def _attribute_profiles_of_class(cls) -> Mapping[str, list[BaseProfile]]:
+        return MappingProxyType({f.name: Base.get_extra_prop(f, "in_profiles") for f in fields(cls)})
+
+    @classmethod
+    @cache
+    def _fields_in_profile(cls, profile: BaseProfile | None) -> frozenset[Field]:
+        return frozenset(
+            f
+            for f in fields(cls)
+            if profile is None or (profile in Base.get_extra_prop(f, "in_profiles"))
+            if f.name != "mRID"
+            if Base.get_extra_prop(f, "is_used")
+        )
+
+    @classmethod
+    @cache
+    def _qualified_attributes_in_profile(cls, profile: BaseProfile | None) -> tuple[tuple[str, str, str | None], ...]:
+        """
+        Returns (qualified name, short name, namespace) of the attributes in the profile, see
+        cgmes_attributes_in_profile. The namespace is None if the namespace of the instance is used.
+        """
+        fields_in_profile = cls._fields_in_profile(profile)
         # What will be returned, has the qualname as key...
-        qual_attrs: dict[str, CgmesAttribute] = {}
+        qual_attrs: dict[str, tuple[str, str, str | None]] = {}
         # ... but we check existence with the unqualified (short) name.
         seen_attrs = set()
 
         # mro contains itself (so parent might be a misnomer) and object, removed with the [:-1].
-        for parent in reversed(self.__class__.__mro__[:-1]):
+        for parent in reversed(cls.__mro__[:-1]):
             for f in fields(parent):
                 shortname = f.name
                 qualname = f"{parent.apparent_name()}.{shortname}"  # type: ignore
-                if f not in self.cgmes_attribute_names_in_profile(profile) or shortname in seen_attrs:
+                if f not in fields_in_profile or shortname in seen_attrs:
                     # Wrong profile or already found from a parent.
                     continue
                 else:
@@ -142,22 +174,19 @@ class Base:
                         # The attribute does not have extra metadata. It might be a custom atttribute
                         # without it, or a base type (int...).
                         # Use the class namespace.
-                        namespace = self.namespace
+                        namespace = None
                     elif (attr_ns := extra.get("namespace", None)) is None:
                         # The attribute has some extras, but not namespace.
                         # Use the class namespace.
-                        namespace = self.namespace
+                        namespace = None
                     else:
                         # The attribute has an explicit namesapce
                         namespace = attr_ns
 
-                    qual_attrs[qualname] = CgmesAttribute(
-                        value=getattr(self, shortname),
-                        namespace=namespace,
-                    )
+                    qual_attrs[qualname] = (qualname, shortname, namespace)
                     seen_attrs.add(shortname)
 
-        return qual_attrs
+        return tuple(qual_attrs.values())
 
     def __str__(self) -> str:
         """Returns the string representation of this resource."""
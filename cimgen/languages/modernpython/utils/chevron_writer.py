@@ -1,5 +1,6 @@
 from collections.abc import Iterable
 from dataclasses import fields
+from functools import cache
 from pathlib import Path
 from typing import Any
 
@@ -184,28 +185,45 @@ class ChevronWriter:
 
     @staticmethod
     def get_attribute_infos(obj: Base) -> dict[str, dict[str, object]]:
-        # the class of this object and the parent classes (excluding class "object").
-        class_and_parent_classes = obj.__class__.__mro__[:-1]
         attr_infos_map: dict[str, dict[str, object]] = {}
+        for attr, descriptor in ChevronWriter._get_attribute_descriptors(obj.__class__):
+            infos = descriptor | {"value": ChevronWriter._get_xml_value(getattr(obj, attr))}
+            if infos["namespace"] is None:
+                infos["namespace"] = obj.namespace
+            attr_infos_map[attr] = infos
+        return attr_infos_map
+
+    @staticmethod
+    @cache
+    def _get_attribute_descriptors(obj_class: type[Base]) -> tuple[tuple[str, dict[str, object]], ...]:
+        """Get the static infos of the used attributes of a CIM type, i.e. all infos except the value.
+
+        The infos depend only on the class, so they are computed once per class.
+        The namespace is None if the namespace of the object should be used.
+
+        :param obj_class:  CIM type.
+        :return:           Tuple of attribute and infos (without value) in the order of get_attribute_infos.
+        """
+        # the class of this object and the parent classes (excluding class "object").
+        class_and_parent_classes = obj_class.__mro__[:-1]
+        descriptors: dict[str, dict[str, object]] = {}
         for cls in reversed(class_and_parent_classes):
             for field in fields(cls):
                 attr = field.name
-                if attr not in attr_infos_map:
+                if attr not in descriptors:
                     attr_name = cls.apparent_name() + "." + attr
                     extra = getattr(field.default, "json_schema_extra", {})
                     if extra.get("is_used"):
-                        infos = {
+                        descriptors[attr] = {
                             "attr_name": attr_name,
-                            "namespace": extra.get("namespace", obj.namespace),
-                            "value": ChevronWriter._get_xml_value(getattr(obj, attr)),
+                            "namespace": extra.get("namespace"),
                             "is_class_attribute": extra.get("is_class_attribute"),
                             "is_datatype_attribute": extra.get("is_datatype_attribute"),
                             "is_enum_attribute": extra.get("is_enum_attribute"),
                             "is_list_attribute": extra.get("is_list_attribute"),
                             "is_primitive_attribute": extra.get("is_primitive_attribute"),
                         }
-                        attr_infos_map[attr] = infos
-        return attr_infos_map
+        return tuple(descriptors.items())
 
     @staticmethod
     def _get_xml_value(value: Any) -> Any:
@@ -1,9 +1,8 @@
-import glob
 import logging
 import os
-from importlib.resources import files
+from pathlib import Path
 
-import chevron
+from cimgen import output_writer, rendering
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +13,7 @@ logger = logging.getLogger(__name__)
 # cgmes_profile_details contains index, names and uris for each profile.
 # We use that to create the header data for the profiles.
 def setup(output_path: str, version: str, cgmes_profile_details: list[dict], namespaces: dict[str, str]) -> None:
-    if not os.path.exists(output_path):
-        os.makedirs(output_path)
-    else:
-        for filename in os.listdir(output_path):
-            os.remove(os.path.join(output_path, filename))
+    output_writer.remove_generated(Path(output_path), "*")
     _create_base(output_path)
     _create_constants(output_path, version, namespaces)
     _create_cgmes_profile(output_path, cgmes_profile_details)
@@ -43,6 +38,10 @@ def get_class_location(class_name: str, class_map: dict, version: str) -> str:
     return "cimpy." + version + ".Base"
 
 
+def required_classes() -> list[str]:
+    return []
+
+
 def run_template(output_path: str, class_details: dict) -> None:
     # Add some attribute infos
     for attribute in class_details["attributes"]:
@@ -55,16 +54,9 @@ def run_template(output_path: str, class_details: dict) -> None:
 
 
 def _write_templated_file(class_file: str, class_details: dict, template_filename: str) -> None:
-    with open(class_file, "w", encoding="utf-8") as file:
-        templates = files("cimgen.languages.python.templates")
-        with templates.joinpath(template_filename).open(encoding="utf-8") as f:
-            args = {
-                "data": class_details,
-                "template": f,
-                "partials_dict": partials,
-            }
-            output = chevron.render(**args)
-        file.write(output)
+    rendering.write_templated_file(
+        class_file, "cimgen.languages.python.templates", template_filename, class_details, partials
+    )
 
 
 # creates the Base class file, all classes inherit from this class
@@ -78,9 +70,7 @@ def _create_base(path: str) -> None:
         "    def printxml(self, dict={}):\n",
         "        return dict\n",
     ]
-    with open(base_path, "w", encoding="utf-8") as f:
-        for line in base:
-            f.write(line)
+    output_writer.write_text(base_path, "".join(base))
 
 
 def _create_constants(output_path: str, version: str, namespaces: dict[str, str]) -> None:
@@ -126,14 +116,12 @@ class_blacklist = ["CGMESProfile", "CimConstants"]
 
 def resolve_headers(path: str, version: str) -> None:  # NOSONAR
     """Add all classes in __init__.py"""
-    filenames = glob.glob(path + "/*.py")
+    filenames = output_writer.generated_files(Path(path), "*.py")
     include_names = []
     for filename in sorted(filenames):
-        include_names.append(os.path.splitext(os.path.basename(filename))[0])
-    with open(path + "/__init__.py", "w", encoding="utf-8") as header_file:
-        for include_name in include_names:
-            if include_name not in class_blacklist:
-                header_file.write(
-                    "from " + "." + include_name + " import " + include_name + " as " + include_name + "\n"
-                )
-        header_file.close()
+        include_names.append(filename.stem)
+    header_text = ""
+    for include_name in include_names:
+        if include_name not in class_blacklist:
+            header_text += "from " + "." + include_name + " import " + include_name + " as " + include_name + "\n"
+    output_writer.write_text(path + "/__init__.py", header_text)
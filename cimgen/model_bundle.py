@@ -0,0 +1,60 @@
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from cimgen import schema_cache
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "cimgen-model-bundle"
+# Increase this number if the structure of the bundle changes.
+BUNDLE_FORMAT_VERSION = 1
+# Bundles with this suffix are compressed with gzip, all other bundles are plain JSON.
+COMPRESSED_SUFFIX = ".gz"
+
+
+def dump(path: Path, version: str, model: dict[str, Any]) -> None:
+    """Write a model bundle.
+
+    The bundle is a JSON document with the format name and version, the cimgen version, the CGMES version and the
+    model. If the path ends with ".gz" the JSON document is compressed with gzip.
+
+    :param path:    Path of the bundle, e.g. "model.json" or "model.json.gz".
+    :param version: CGMES version of the model, e.g. version = "cgmes_v2_4_15"
+    :param model:   Model as JSON compatible dictionary.
+    """
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "cimgen_version": schema_cache.get_cimgen_version(),
+        "cgmes_version": version,
+        "model": model,
+    }
+    data = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if path.name.endswith(COMPRESSED_SUFFIX):
+        data = gzip.compress(data, mtime=0)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    logger.info(f"Model bundle written to '{path}'.")
+
+
+def load(path: Path) -> tuple[str, dict[str, Any]]:
+    """Read a model bundle written by dump.
+
+    :param path: Path of the bundle, compressed bundles are recognized by their content.
+    :return:     CGMES version and model as JSON compatible dictionary.
+    """
+    data = path.read_bytes()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    bundle = json.loads(data)
+    if not isinstance(bundle, dict) or bundle.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"'{path}' is not a cimgen model bundle.")
+    if bundle.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"Model bundle '{path}' has format version {bundle.get('format_version')},"
+            + f" supported is version {BUNDLE_FORMAT_VERSION}."
+        )
+    return bundle["cgmes_version"], bundle["model"]
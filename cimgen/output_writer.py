@@ -0,0 +1,385 @@
+import hashlib
+import io
+import json
+import logging
+import shutil
+import tarfile
+import time
+import zipfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fnmatch import fnmatch
+from pathlib import Path
+from time import perf_counter
+
+from cimgen import profiling
+
+logger = logging.getLogger(__name__)
+
+
+class OutputWriter:
+    """Writer for the generated files.
+
+    All files of a generation run are written with the functions of this module, so that the writer knows the
+    complete set of generated files.
+    In incremental mode a file is only written if its content has changed, and previously generated files are only
+    removed if they are not generated again (stale files). This keeps the modification time of unchanged files,
+    so that downstream builds only recompile what has really changed.
+    """
+
+    def __init__(self, incremental: bool = False, record_hashes: bool = False):
+        """Constructor.
+
+        :param incremental:   Write only changed files and remove only stale files.
+        :param record_hashes: Record the content hashes of the generated files (for a manifest).
+        """
+        self.incremental = incremental
+        self.written_files: dict[Path, None] = {}  # used as ordered set
+        self.stale_candidates: dict[Path, None] = {}  # used as ordered set
+        self.hashes: dict[Path, str] | None = {} if record_hashes else None
+        self.changed_count = 0
+        self.unchanged_count = 0
+
+    def write_text(self, path: Path | str, text: str) -> None:
+        """Write a generated text file.
+
+        :param path: Path of the file.
+        :param text: Content of the file.
+        """
+        t0 = perf_counter()
+        path = Path(path)
+        self.written_files[path] = None
+        if self.hashes is not None:
+            self.hashes[path] = _hash(text.encode("utf-8"))
+        if self.incremental and _read_text(path) == text:
+            self.unchanged_count += 1
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", encoding="utf-8") as file:
+                file.write(text)
+            self.changed_count += 1
+        profiling.add_time("write", path.suffix, perf_counter() - t0)
+
+    def copy_file(self, source: Path, path: Path) -> None:
+        """Copy a static file into the output directory.
+
+        :param source: Path of the source file.
+        :param path:   Path of the copied file.
+        """
+        t0 = perf_counter()
+        self.written_files[path] = None
+        if self.hashes is not None:
+            self.hashes[path] = _hash(source.read_bytes())
+        if self.incremental and path.is_file() and path.read_bytes() == source.read_bytes():
+            self.unchanged_count += 1
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(source, path)
+            self.changed_count += 1
+        profiling.add_time("copy", path.suffix, perf_counter() - t0)
+
+    def remove_generated(self, directory: Path, pattern: str) -> None:
+        """Remove previously generated files.
+
+        In incremental mode the files are only removed at the end of the run (see finish)
+        if they have not been generated again.
+
+        :param directory: Output directory.
+        :param pattern:   Glob pattern of the generated files, e.g. "**/*.java".
+        """
+        for path in directory.glob(pattern):
+            if path.is_file():
+                if self.incremental:
+                    self.stale_candidates[path] = None
+                else:
+                    path.unlink()
+
+    def generated_files(self, directory: Path, pattern: str) -> list[Path]:
+        """Get the files generated in this run.
+
+        This should be used instead of searching the output directory, because in incremental mode
+        the output directory could contain stale files until the end of the run.
+
+        :param directory: Output directory.
+        :param pattern:   Glob pattern, e.g. "*.hpp" (only files in directory) or "**/*.hpp" (also subdirectories).
+        :return:          Sorted list of generated files.
+        """
+        return sorted(path for path in self.written_files if _matches(path, directory, pattern))
+
+    def finish(self) -> None:
+        """Finish the generation run: remove stale files in incremental mode."""
+        removed_count = 0
+        for path in self.stale_candidates:
+            if path not in self.written_files and path.is_file():
+                path.unlink()
+                removed_count += 1
+        self.stale_candidates = {}
+        if self.incremental:
+            logger.info(
+                f"Changed files: {self.changed_count}, unchanged files: {self.unchanged_count},"
+                + f" removed files: {removed_count}."
+            )
+
+
+class ArchiveWriter(OutputWriter):
+    """Writer for the generated files streaming all files into one zip or tar archive instead of a directory.
+
+    The paths of the archive members are relative to the root directory, nothing is written into the root directory.
+    Previously generated files are not removed (the archive is always created anew), so the incremental mode is not
+    supported.
+    """
+
+    def __init__(self, archive: Path, root: Path, record_hashes: bool = False):
+        """Constructor.
+
+        :param archive:       Path of the archive, the suffix ".zip", ".tar", ".tar.gz" or ".tgz" selects the format.
+        :param root:          Directory the paths of the generated files are relative to.
+        :param record_hashes: Record the content hashes of the generated files (for a manifest).
+        """
+        super().__init__(record_hashes=record_hashes)
+        self.archive = archive
+        self.root = root
+        self.mtime = time.time()
+        name = archive.name.lower()
+        archive.parent.mkdir(parents=True, exist_ok=True)
+        self.zip_file: zipfile.ZipFile | None = None
+        self.tar_file: tarfile.TarFile | None = None
+        if name.endswith(".zip"):
+            self.zip_file = zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED)
+        elif name.endswith((".tar.gz", ".tgz")):
+            self.tar_file = tarfile.open(archive, "w:gz")
+        elif name.endswith(".tar"):
+            self.tar_file = tarfile.open(archive, "w")
+        else:
+            raise ValueError(f"Unsupported archive format of '{archive}', use .zip, .tar, .tar.gz or .tgz.")
+
+    def write_text(self, path: Path | str, text: str) -> None:
+        t0 = perf_counter()
+        path = Path(path)
+        self.written_files[path] = None
+        self._add_member(path, text.encode("utf-8"))
+        self.changed_count += 1
+        profiling.add_time("write", path.suffix, perf_counter() - t0)
+
+    def copy_file(self, source: Path, path: Path) -> None:
+        t0 = perf_counter()
+        self.written_files[path] = None
+        self._add_member(path, source.read_bytes())
+        self.changed_count += 1
+        profiling.add_time("copy", path.suffix, perf_counter() - t0)
+
+    def remove_generated(self, directory: Path, pattern: str) -> None:
+        # The archive contains only the files of this run.
+        pass
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Close the archive."""
+        if self.zip_file:
+            self.zip_file.close()
+        if self.tar_file:
+            self.tar_file.close()
+        logger.info(f"{self.changed_count} files written to archive '{self.archive}'.")
+
+    def _add_member(self, path: Path, data: bytes) -> None:
+        if self.hashes is not None:
+            self.hashes[path] = _hash(data)
+        name = path.relative_to(self.root).as_posix()
+        if self.zip_file:
+            info = zipfile.ZipInfo(name, time.localtime(self.mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self.zip_file.writestr(info, data)
+        elif self.tar_file:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(self.mtime)
+            info.mode = 0o644
+            self.tar_file.addfile(info, io.BytesIO(data))
+
+
+class CheckWriter(OutputWriter):
+    """Writer comparing the generated files with an existing output tree or a manifest instead of writing them.
+
+    Nothing is written or removed. Files are differing if their content has changed, missing if they don't exist
+    in the output tree (or manifest), and stale if they exist in the output tree (or manifest) and would be removed
+    because they are not generated anymore.
+    """
+
+    def __init__(self, root: Path, manifest: dict[str, str] | None = None):
+        """Constructor.
+
+        :param root:     Directory the paths of the manifest are relative to.
+        :param manifest: Map of relative path to content hash, see read_manifest (None: compare with the files).
+        """
+        super().__init__(record_hashes=True)
+        self.root = root
+        self.manifest = manifest
+        self.differing_files: list[Path] = []
+        self.missing_files: list[Path] = []
+        self.existing_files: dict[Path, None] = {}  # used as ordered set
+
+    def write_text(self, path: Path | str, text: str) -> None:
+        t0 = perf_counter()
+        path = Path(path)
+        self.written_files[path] = None
+        self._compare(path, text.encode("utf-8"))
+        profiling.add_time("check", path.suffix, perf_counter() - t0)
+
+    def copy_file(self, source: Path, path: Path) -> None:
+        t0 = perf_counter()
+        self.written_files[path] = None
+        self._compare(path, source.read_bytes())
+        profiling.add_time("check", path.suffix, perf_counter() - t0)
+
+    def remove_generated(self, directory: Path, pattern: str) -> None:
+        if self.manifest is None:
+            for path in directory.glob(pattern):
+                if path.is_file():
+                    self.existing_files[path] = None
+        else:
+            for name in self.manifest:
+                path = self.root / name
+                if _matches(path, directory, pattern):
+                    self.existing_files[path] = None
+
+    def finish(self) -> None:
+        pass
+
+    def differences(self) -> dict[str, list[str]]:
+        """Get the differences between the generated files and the output tree (or manifest).
+
+        :return: Map of "differing", "missing" and "stale" to the sorted paths relative to the root directory.
+        """
+        stale_files = [path for path in self.existing_files if path not in self.written_files]
+        return {
+            "differing": sorted(_relative_name(path, self.root) for path in self.differing_files),
+            "missing": sorted(_relative_name(path, self.root) for path in self.missing_files),
+            "stale": sorted(_relative_name(path, self.root) for path in stale_files),
+        }
+
+    def _compare(self, path: Path, data: bytes) -> None:
+        digest = _hash(data)
+        self.hashes[path] = digest
+        if self.manifest is None:
+            if not path.is_file():
+                self.missing_files.append(path)
+            elif path.read_bytes() != data:
+                self.differing_files.append(path)
+        else:
+            expected = self.manifest.get(_relative_name(path, self.root))
+            if expected is None:
+                self.missing_files.append(path)
+            elif expected != digest:
+                self.differing_files.append(path)
+
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+def write_manifest(path: Path, root: Path, hashes: dict[Path, str]) -> None:
+    """Write a manifest with the content hashes of the generated files.
+
+    :param path:   Path of the manifest (JSON).
+    :param root:   Directory the paths in the manifest are relative to.
+    :param hashes: Map of the path of a generated file to its content hash.
+    """
+    files = {_relative_name(file, root): digest for file, digest in hashes.items()}
+    manifest = {"format_version": MANIFEST_FORMAT_VERSION, "files": dict(sorted(files.items()))}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+        file.write("\n")
+    logger.info(f"Manifest with {len(files)} files written to '{path}'.")
+
+
+def read_manifest(path: Path) -> dict[str, str]:
+    """Read a manifest written by write_manifest.
+
+    :param path: Path of the manifest.
+    :return:     Map of the relative path of a generated file to its content hash.
+    """
+    with path.open(encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+        raise ValueError(f"Manifest '{path}' has an unsupported format version {manifest.get('format_version')}.")
+    return manifest["files"]
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _relative_name(path: Path, root: Path) -> str:
+    return path.relative_to(root).as_posix()
+
+
+def _matches(path: Path, directory: Path, pattern: str) -> bool:
+    # Match a path with a glob pattern like "*.hpp" (only files in directory) or "**/*.hpp" (also subdirectories)
+    if not path.is_relative_to(directory):
+        return False
+    relative_path = path.relative_to(directory)
+    recursive = pattern.startswith("**/")
+    return (recursive or len(relative_path.parts) == 1) and fnmatch(relative_path.name, pattern.removeprefix("**/"))
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        with path.open(encoding="utf-8") as file:
+            return file.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+_current_writer: ContextVar[OutputWriter | None] = ContextVar("current_writer", default=None)
+
+
+def get_writer() -> OutputWriter:
+    """Get the writer of the current generation run.
+
+    :return: Current writer, or a new (non-incremental) writer used only for this call if no writer has been set.
+    """
+    writer = _current_writer.get()
+    if writer is None:
+        # Not stored, so that files written without a generation run don't pile up in one writer
+        return OutputWriter()
+    return writer
+
+
+@contextmanager
+def use_writer(writer: OutputWriter) -> Iterator[OutputWriter]:
+    """Set the writer of the current generation run.
+
+    :param writer: Writer used for all files written in the with block.
+    """
+    token = _current_writer.set(writer)
+    try:
+        yield writer
+    finally:
+        _current_writer.reset(token)
+
+
+def write_text(path: Path | str, text: str) -> None:
+    """Write a generated text file with the current writer, see OutputWriter.write_text."""
+    get_writer().write_text(path, text)
+
+
+def copy_file(source: Path, path: Path) -> None:
+    """Copy a static file with the current writer, see OutputWriter.copy_file."""
+    get_writer().copy_file(source, path)
+
+
+def remove_generated(directory: Path, pattern: str) -> None:
+    """Remove previously generated files with the current writer, see OutputWriter.remove_generated."""
+    get_writer().remove_generated(directory, pattern)
+
+
+def generated_files(directory: Path, pattern: str) -> list[Path]:
+    """Get the files generated by the current writer, see OutputWriter.generated_files."""
+    writer = _current_writer.get()
+    if writer is None:
+        raise RuntimeError("No writer of a generation run has been set, use use_writer to set it.")
+    return writer.generated_files(directory, pattern)
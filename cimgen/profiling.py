@@ -0,0 +1,239 @@
+import json
+import logging
+import platform
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from time import perf_counter, process_time
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """Collects wall time, CPU time and memory usage of the phases of a generation run.
+
+    The phases are measured with the phase context manager. Besides the phases the profiler sums up timings of
+    frequent operations by category and key (e.g. the renders per template or the parse time per RDF file),
+    see add_time. The collected data is written as JSON report with write_report.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """Constructor.
+
+        :param trace_memory: Measure the peak of the memory allocated by python in each phase with tracemalloc
+                             (slows down the generation).
+        """
+        self.trace_memory = trace_memory
+        self.phases: list[dict] = []
+        self.timings: dict[str, dict[str, dict[str, float]]] = {}
+        self._open_phases: list[dict] = []
+        self._start = (perf_counter(), process_time(), _get_children_cpu_time())
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str, **details: Any) -> Iterator[None]:
+        """Measure a phase of the generation run.
+
+        Phases can be nested, the report contains the depth of each phase.
+
+        :param name:    Name of the phase, e.g. "parse".
+        :param details: Additional information stored with the phase, e.g. language="cpp".
+        """
+        record: dict = {"name": name, "depth": len(self._open_phases), **details}
+        self.phases.append(record)
+        if self.trace_memory:
+            self._update_traced_peak()
+            tracemalloc.reset_peak()
+            record["traced_peak_bytes"] = 0
+        self._open_phases.append(record)
+        wall, cpu, children_cpu = perf_counter(), process_time(), _get_children_cpu_time()
+        try:
+            yield
+        finally:
+            record["wall_time"] = perf_counter() - wall
+            record["cpu_time"] = process_time() - cpu
+            record["children_cpu_time"] = _get_children_cpu_time() - children_cpu
+            record["peak_rss_bytes"] = _get_peak_rss()
+            if self.trace_memory:
+                self._update_traced_peak()
+            self._open_phases.pop()
+
+    def _update_traced_peak(self) -> None:
+        # The peak of tracemalloc is reset at the start of each phase, so the peak is added to all open phases.
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self._open_phases:
+            record["traced_peak_bytes"] = max(record["traced_peak_bytes"], peak)
+
+    def add_time(self, category: str, key: str, seconds: float, count: int = 1) -> None:
+        """Add the time of an operation to the timings.
+
+        :param category: Category of the operation, e.g. "render".
+        :param key:      Key of the operation within the category, e.g. the template filename.
+        :param seconds:  Wall time of the operation.
+        :param count:    Number of operations.
+        """
+        timing = self.timings.setdefault(category, {}).setdefault(key, {"count": 0, "wall_time": 0.0})
+        timing["count"] += count
+        timing["wall_time"] += seconds
+
+    def get_data(self) -> dict:
+        """Get the collected phases and timings, e.g. to merge them into the profiler of the main process.
+
+        :return: Phases and timings.
+        """
+        return {"phases": self.phases, "timings": self.timings}
+
+    def merge(self, data: dict, **details: Any) -> None:
+        """Merge the phases and timings collected by another profiler, e.g. in a worker process.
+
+        :param data:    Phases and timings, see get_data.
+        :param details: Additional information stored with the merged phases, e.g. worker=True.
+        """
+        depth = len(self._open_phases)
+        for record in data["phases"]:
+            self.phases.append({**record, "depth": record["depth"] + depth, **details})
+        for category, timings in data["timings"].items():
+            for key, timing in timings.items():
+                self.add_time(category, key, timing["wall_time"], timing["count"])
+
+    def report(self, **metadata: Any) -> dict:
+        """Create the report.
+
+        :param metadata: Information about the generation run, e.g. the CGMES version.
+        :return:         Report with the total times, the phases and the timings.
+        """
+        wall, cpu, children_cpu = self._start
+        total = {
+            "wall_time": perf_counter() - wall,
+            "cpu_time": process_time() - cpu,
+            "children_cpu_time": _get_children_cpu_time() - children_cpu,
+            "peak_rss_bytes": _get_peak_rss(),
+        }
+        if self.trace_memory:
+            total["traced_peak_bytes"] = max((p.get("traced_peak_bytes", 0) for p in self.phases), default=0)
+        timings = {
+            category: dict(sorted(timings.items(), key=lambda item: item[1]["wall_time"], reverse=True))
+            for category, timings in self.timings.items()
+        }
+        return {
+            "metadata": {"python": platform.python_version(), "platform": sys.platform, **metadata},
+            "total": total,
+            "phases": self.phases,
+            "timings": timings,
+        }
+
+    def write_report(self, path: Path, **metadata: Any) -> None:
+        """Write the report as JSON file.
+
+        :param path:     Path of the report.
+        :param metadata: Information about the generation run, e.g. the CGMES version.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            json.dump(self.report(**metadata), file, indent=2)
+            file.write("\n")
+        logger.info(f"Profile report written to '{path}'.")
+
+
+def _get_children_cpu_time() -> float:
+    # CPU time of the terminated worker processes
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _get_peak_rss() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is given in bytes on macOS and in kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+_current_profiler: ContextVar[Profiler | None] = ContextVar("current_profiler", default=None)
+
+
+def current() -> Profiler | None:
+    """Get the profiler of the current generation run.
+
+    :return: Current profiler or None if the generation run is not profiled.
+    """
+    return _current_profiler.get()
+
+
+@contextmanager
+def use_profiler(profiler: Profiler | None) -> Iterator[Profiler | None]:
+    """Set the profiler of the current generation run.
+
+    :param profiler: Profiler used for all phases in the with block (None: no profiling).
+    """
+    token = _current_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current_profiler.reset(token)
+
+
+@contextmanager
+def phase(name: str, **details: Any) -> Iterator[None]:
+    """Measure a phase with the current profiler, see Profiler.phase. Does nothing without profiler."""
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.phase(name, **details):
+        yield
+
+
+def add_time(category: str, key: str, seconds: float, count: int = 1) -> None:
+    """Add the time of an operation with the current profiler, see Profiler.add_time. Does nothing without profiler."""
+    profiler = _current_profiler.get()
+    if profiler is not None:
+        profiler.add_time(category, key, seconds, count)
+
+
+def get_worker_settings() -> dict | None:
+    """Get the settings needed to profile a function in a worker process, see run_in_worker.
+
+    :return: Settings of the current profiler or None if the generation run is not profiled.
+    """
+    profiler = _current_profiler.get()
+    if profiler is None:
+        return None
+    return {"trace_memory": profiler.trace_memory}
+
+
+def run_in_worker(settings: dict | None, function: Callable, *args: Any) -> tuple[Any, dict | None]:
+    """Run a function in a worker process with a new profiler.
+
+    :param settings: Settings returned by get_worker_settings in the main process (None: no profiling).
+    :param function: Function to run, it has to be picklable.
+    :param args:     Arguments of the function.
+    :return:         Result of the function and the data of the profiler to be merged with merge_worker_data.
+    """
+    profiler = Profiler(**settings) if settings is not None else None
+    with use_profiler(profiler):
+        result = function(*args)
+    return result, profiler.get_data() if profiler else None
+
+
+def merge_worker_data(data: dict | None, **details: Any) -> None:
+    """Merge the data of a profiler in a worker process into the current profiler, see Profiler.merge.
+
+    :param data:    Data returned by run_in_worker.
+    :param details: Additional information stored with the merged phases.
+    """
+    profiler = _current_profiler.get()
+    if profiler is not None and data is not None:
+        profiler.merge(data, **details)
@@ -0,0 +1,349 @@
+import difflib
+import logging
+import pickle
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib.resources import files
+from pathlib import Path
+from time import perf_counter
+
+import chevron
+
+from cimgen import output_writer, profiling
+from cimgen.template_compiler import UnsupportedTemplateError, compile_template
+
+logger = logging.getLogger(__name__)
+
+
+TEMPLATE_ENGINES = ("compiled", "chevron", "verify")
+
+
+class CachedTemplate:
+    """Template in the registry: tokens and compiled render function."""
+
+    def __init__(self, name: str, tokens: list[tuple[str, str]]):
+        """Constructor.
+
+        :param name:   Filename of the template.
+        :param tokens: Tokens of the template created by chevron.tokenizer.tokenize.
+        """
+        self.name = name
+        self.tokens = tokens
+        self._compiled: Callable[[dict], str] | None = None
+        self._compile_error: UnsupportedTemplateError | None = None
+
+    def compiled(self) -> Callable[[dict], str] | None:
+        """Get the compiled render function, compile the template on first use.
+
+        :return: Render function or None if the template could not be compiled.
+        """
+        if self._compiled is None and self._compile_error is None:
+            try:
+                self._compiled = compile_template(self.tokens, self.name)
+            except UnsupportedTemplateError as error:
+                logger.info(f"Template '{self.name}' is rendered with chevron: {error}.")
+                self._compile_error = error
+        return self._compiled
+
+
+class TemplateRegistry:
+    """Registry of the mustache templates of all language packages.
+
+    Each template is loaded and tokenized only once, all later renders reuse the tokens (and the compiled render
+    function). The registry is shared by all generation runs of the process, the template engine and the render
+    statistics belong to the generation run (see Renderer).
+    """
+
+    def __init__(self):
+        self.templates: dict[tuple[str, str], CachedTemplate] = {}
+
+    def is_cached(self, template_package: str, template_filename: str) -> bool:
+        """Check if a template is in the registry.
+
+        :param template_package:  Package containing the template, e.g. "cimgen.languages.cpp.templates".
+        :param template_filename: Filename of the template in the package.
+        :return:                  Template is in the registry?
+        """
+        return (template_package, template_filename) in self.templates
+
+    def get_template(self, template_package: str, template_filename: str) -> CachedTemplate:
+        """Get a template, load and tokenize the template if it is not in the registry yet.
+
+        :param template_package:  Package containing the template, e.g. "cimgen.languages.cpp.templates".
+        :param template_filename: Filename of the template in the package.
+        :return:                  Template.
+        """
+        key = (template_package, template_filename)
+        if key in self.templates:
+            return self.templates[key]
+        text = files(template_package).joinpath(template_filename).read_text(encoding="utf-8")
+        template = CachedTemplate(template_filename, list(chevron.tokenizer.tokenize(text)))
+        self.templates[key] = template
+        return template
+
+    def invalidate(self, template_package: str, template_filename: str | None = None) -> None:
+        """Remove templates from the registry, so they are loaded again on the next render (e.g. after a change).
+
+        :param template_package:  Package containing the templates, e.g. "cimgen.languages.cpp.templates".
+        :param template_filename: Filename of the template in the package (None: all templates of the package).
+        """
+        for key in list(self.templates):
+            if key[0] == template_package and template_filename in (None, key[1]):
+                del self.templates[key]
+
+
+registry = TemplateRegistry()
+
+
+class Renderer:
+    """Template engine and render statistics of a generation run.
+
+    Depending on the engine the templates of the registry are rendered with:
+      - compiled: python render functions compiled from the tokens (see template_compiler),
+        chevron is used as fallback for templates with unsupported features.
+      - chevron:  the chevron renderer.
+      - verify:   both, differences are logged and the result of chevron is used.
+    """
+
+    def __init__(self, engine: str = "compiled"):
+        """Constructor.
+
+        :param engine: Template engine, one of TEMPLATE_ENGINES.
+        """
+        self.engine = engine
+        self.statistics: Counter[str] = Counter()
+
+    def render(self, template_package: str, template_filename: str, data: dict, partials: dict | None = None) -> str:
+        """Render a template, see render_template."""
+        self.statistics["renders"] += 1
+        if registry.is_cached(template_package, template_filename):
+            self.statistics["cached_renders"] += 1
+        template = registry.get_template(template_package, template_filename)
+        compiled = template.compiled() if self.engine != "chevron" else None
+        if compiled is None:
+            return chevron.render(template=template.tokens, data=data, partials_dict=partials or {})
+        try:
+            output = compiled(data)
+        except UnsupportedTemplateError:
+            self.statistics["fallback_renders"] += 1
+            return chevron.render(template=template.tokens, data=data, partials_dict=partials or {})
+        if self.engine == "verify":
+            expected = chevron.render(template=template.tokens, data=data, partials_dict=partials or {})
+            if output != expected:
+                self.statistics["different_renders"] += 1
+                diff = difflib.unified_diff(
+                    expected.splitlines(keepends=True), output.splitlines(keepends=True), "chevron", "compiled"
+                )
+                logger.warning(f"Different output of template '{template_filename}':\n{''.join(diff)}")
+                output = expected
+        return output
+
+    def log_statistics(self) -> None:
+        """Log how many renders used templates from the registry (and differences in verify mode)."""
+        logger.info(
+            f"Rendered templates: {self.statistics['renders']}, from cache: {self.statistics['cached_renders']},"
+            + f" rendered with chevron as fallback: {self.statistics['fallback_renders']}."
+        )
+        if self.engine == "verify":
+            if self.statistics["different_renders"]:
+                logger.warning(
+                    f"Compiled templates and chevron differ in {self.statistics['different_renders']}"
+                    + f" of {self.statistics['renders']} renders."
+                )
+            else:
+                logger.info(f"Compiled templates and chevron are identical in {self.statistics['renders']} renders.")
+
+
+_current_renderer: ContextVar[Renderer | None] = ContextVar("current_renderer", default=None)
+
+
+def get_renderer() -> Renderer:
+    """Get the renderer of the current generation run.
+
+    :return: Current renderer, or a new renderer (compiled engine) used only for this call if no renderer has been set.
+    """
+    renderer = _current_renderer.get()
+    if renderer is None:
+        return Renderer()
+    return renderer
+
+
+@contextmanager
+def use_renderer(renderer: Renderer) -> Iterator[Renderer]:
+    """Set the renderer of the current generation run.
+
+    :param renderer: Renderer used for all templates rendered in the with block.
+    """
+    token = _current_renderer.set(renderer)
+    try:
+        yield renderer
+    finally:
+        _current_renderer.reset(token)
+
+
+def render_template(template_package: str, template_filename: str, data: dict, partials: dict | None = None) -> str:
+    """Render a mustache template of a language package with the renderer of the current generation run.
+
+    :param template_package:  Package containing the template, e.g. "cimgen.languages.cpp.templates".
+    :param template_filename: Filename of the template in the package.
+    :param data:              Data used to render the template.
+    :param partials:          Partial templates (None: no partials).
+    :return:                  Rendered text.
+    """
+    return get_renderer().render(template_package, template_filename, data, partials)
+
+
+def write_templated_file(
+    path: Path | str, template_package: str, template_filename: str, data: dict, partials: dict | None = None
+) -> None:
+    """Render a mustache template and write the result with the current output writer.
+
+    Inside a with block of render_in_parallel the template is rendered by a worker process instead,
+    the result is written when the with block is left.
+
+    :param path:              Path of the generated file.
+    :param template_package:  Package containing the template, e.g. "cimgen.languages.cpp.templates".
+    :param template_filename: Filename of the template in the package.
+    :param data:              Data used to render the template.
+    :param partials:          Partial templates (None: no partials).
+    """
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.setdefault((template_package, template_filename), []).append((path, _pickle_data(data), partials))
+    pool = _current_pool.get()
+    if pool:
+        pool.submit(path, template_package, template_filename, data, partials)
+    else:
+        t0 = perf_counter()
+        output = render_template(template_package, template_filename, data, partials)
+        profiling.add_time("render", template_filename, perf_counter() - t0)
+        output_writer.write_text(path, output)
+
+
+class RenderPool:
+    """Pool of worker processes rendering templates.
+
+    The data of a template is serialized when the template is submitted, so later changes of the data by the
+    language package do not affect the result. The rendered files are written in the order of submission,
+    so the set and the order of the generated files is the same as without worker processes.
+    """
+
+    def __init__(self, workers: int):
+        """Constructor.
+
+        :param workers: Number of worker processes.
+        """
+        self.executor = ProcessPoolExecutor(workers)
+        self.renderer = get_renderer()
+        self.pending: list[tuple[Path | str, str, Future]] = []
+
+    def submit(
+        self, path: Path | str, template_package: str, template_filename: str, data: dict, partials: dict | None
+    ) -> None:
+        """Submit the rendering of a template, see write_templated_file."""
+        pickled_data = _pickle_data(data)
+        future = self.executor.submit(
+            _render_in_worker, self.renderer.engine, template_package, template_filename, pickled_data, partials
+        )
+        self.pending.append((path, template_filename, future))
+
+    def finish(self) -> None:
+        """Wait for all submitted templates and write the rendered files in the order of submission."""
+        try:
+            for path, template_filename, future in self.pending:
+                output, statistics, render_time = future.result()
+                self.renderer.statistics.update(statistics)
+                profiling.add_time("render", template_filename, render_time)
+                output_writer.write_text(path, output)
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        """Cancel all pending templates and stop the worker processes."""
+        self.pending = []
+        self.executor.shutdown(cancel_futures=True)
+
+
+def _render_in_worker(
+    engine: str, template_package: str, template_filename: str, pickled_data: bytes, partials: dict | None
+) -> tuple[str, Counter[str], float]:
+    # The worker process has its own registry, the statistics of the render are added to the renderer of the run.
+    renderer = Renderer(engine)
+    data = pickle.loads(pickled_data)
+    t0 = perf_counter()
+    output = renderer.render(template_package, template_filename, data, partials)
+    return output, renderer.statistics, perf_counter() - t0
+
+
+def _pickle_data(data: dict) -> bytes:
+    # The language package module is part of the class details, but it is not needed (and not picklable).
+    data = {key: value for key, value in data.items() if key != "lang_pack"}
+    return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+_current_pool: ContextVar[RenderPool | None] = ContextVar("current_pool", default=None)
+
+
+@contextmanager
+def render_in_parallel(jobs: int) -> Iterator[None]:
+    """Render the templates written with write_templated_file in worker processes.
+
+    All files are written when the with block is left. With less than two jobs the files are rendered and written
+    immediately.
+
+    :param jobs: Number of worker processes (1: no worker processes).
+    """
+    if jobs < 2:
+        yield
+        return
+    pool = RenderPool(jobs)
+    token = _current_pool.set(pool)
+    try:
+        yield
+    except BaseException:
+        pool.cancel()
+        raise
+    finally:
+        _current_pool.reset(token)
+    pool.finish()
+
+
+# Renders recorded by record_renders: (template package, template filename) -> list of (path, pickled data, partials)
+RenderLog = dict[tuple[str, str], list[tuple[Path | str, bytes, dict | None]]]
+
+_current_recorder: ContextVar[RenderLog | None] = ContextVar("current_recorder", default=None)
+
+
+@contextmanager
+def record_renders() -> Iterator[RenderLog]:
+    """Record the templates written with write_templated_file, so the files could be rendered again with
+    render_again, e.g. after a template has been changed.
+
+    The data of a template is serialized when the template is written, later changes of the data have no effect.
+    """
+    log: RenderLog = {}
+    token = _current_recorder.set(log)
+    try:
+        yield log
+    finally:
+        _current_recorder.reset(token)
+
+
+def render_again(log: RenderLog, template_package: str, template_filename: str) -> int:
+    """Render the files recorded for a template again and write them with the current output writer.
+
+    :param log:               Renders recorded by record_renders.
+    :param template_package:  Package containing the template, e.g. "cimgen.languages.cpp.templates".
+    :param template_filename: Filename of the template in the package.
+    :return:                  Number of rendered files.
+    """
+    renders = log.get((template_package, template_filename), [])
+    for path, pickled_data, partials in renders:
+        t0 = perf_counter()
+        output = render_template(template_package, template_filename, pickle.loads(pickled_data), partials)
+        profiling.add_time("render", template_filename, perf_counter() - t0)
+        output_writer.write_text(path, output)
+    return len(renders)
@@ -0,0 +1,92 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Increase this number if the structure of the cached data changes.
+CACHE_FORMAT_VERSION = 3
+CACHE_FILE_SUFFIX = ".model.pickle"
+
+
+def get_cimgen_version() -> str:
+    try:
+        return package_version("cimgen")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_cache_key(directory: Path, files: list[Path], version: str) -> str:
+    """Get the key of the cached model for a set of schema files.
+
+    The key is a hash of the content and the relative path of all schema files, the CGMES version, the cimgen version
+    and the format version of the cache.
+
+    :param directory: Schema directory.
+    :param files:     Schema files in the order they are parsed.
+    :param version:   CGMES version, e.g. version = "cgmes_v2_4_15"
+    :return:          Cache key.
+    """
+    key = hashlib.sha256()
+    key.update(f"{CACHE_FORMAT_VERSION}\n{get_cimgen_version()}\n{version}\n".encode())
+    for file in files:
+        key.update(file.relative_to(directory).as_posix().encode() + b"\n")
+        key.update(hashlib.sha256(file.read_bytes()).digest())
+    return key.hexdigest()
+
+
+def load(cache_dir: Path, key: str) -> Any | None:
+    """Load a cached model.
+
+    :param cache_dir: Cache directory.
+    :param key:       Cache key, see get_cache_key.
+    :return:          Cached data or None if there is no usable cache entry.
+    """
+    cache_file = cache_dir / (key + CACHE_FILE_SUFFIX)
+    if not cache_file.exists():
+        return None
+    try:
+        with cache_file.open("rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as error:
+        logger.warning(f"Ignore unusable cache file '{cache_file}': {error}")
+        return None
+
+
+def store(cache_dir: Path, key: str, data: Any) -> None:
+    """Store a model in the cache.
+
+    The data is written to a temporary file first, so concurrent runs never read an incomplete cache file.
+
+    :param cache_dir: Cache directory.
+    :param key:       Cache key, see get_cache_key.
+    :param data:      Data to store.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_dir / (key + CACHE_FILE_SUFFIX))
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def clear(cache_dir: Path) -> int:
+    """Remove all cached models from the cache directory.
+
+    :param cache_dir: Cache directory.
+    :return:          Number of removed cache files.
+    """
+    count = 0
+    for cache_file in cache_dir.glob("*" + CACHE_FILE_SUFFIX):
+        cache_file.unlink()
+        count += 1
+    return count
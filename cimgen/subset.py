@@ -0,0 +1,316 @@
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cimgen.cimgen import CIMComponentDefinition, GenerationSession
+
+logger = logging.getLogger(__name__)
+
+
+class SelectionError(ValueError):
+    """Unknown profile or class in the selection of the classes to generate."""
+
+
+def select_profiles(
+    class_dict: dict[str, "CIMComponentDefinition"],
+    session: "GenerationSession",
+    profiles: list[str],
+    required_classes: list[str] | None = None,
+) -> dict[str, "CIMComponentDefinition"]:
+    """Reduce the merged classes to the classes and attributes of some profiles.
+
+    Classes and attributes are kept if one of their origins is a selected profile. Additionally all classes and
+    attributes needed by them or by the language packages (required_classes) are kept (dependency closure):
+    superclasses, the classes of the attributes (datatypes, enums, primitives and associated classes) and the inverse
+    roles of associations. Datatype classes keep all their attributes (value, unit, multiplier).
+    The origins are reduced to the selected profiles. Classes kept as dependency without a selected origin
+    (e.g. abstract superclasses like Equipment) get the profiles of their kept attributes, their kept subclasses
+    and the kept attributes using them, or the selected profiles if there are none. Attributes kept as dependency
+    without a selected origin keep their origins.
+    The profiles of the session (used for the profile enums and profile uris) are reduced to the selected profiles
+    and the profiles still used as origin, the used namespaces to the namespaces of the kept classes.
+
+    The classes are changed in place, the superclasses and subclasses have to be computed again afterwards.
+
+    :param class_dict:       Map of class name to merged class info.
+    :param session:          Session of the generation run.
+    :param profiles:         Short names of the selected profiles, e.g. ["EQ", "SSH", "TP", "SV"].
+    :param required_classes: Names of the classes needed by the language packages, e.g. the classes used by their
+                             static files.
+    :return:                 Map of class name to class info of the kept classes in the original order.
+    """
+    unknown = [profile for profile in profiles if profile not in session.package_listed_by_short_name]
+    if unknown:
+        raise SelectionError(
+            f"Unknown profiles: {', '.join(unknown)}."
+            + f" Available profiles: {', '.join(session.package_listed_by_short_name)}."
+        )
+    selected = set(profiles)
+
+    closure = _DependencyClosure(class_dict)
+    for class_name, class_infos in class_dict.items():
+        if selected.intersection(class_infos.origins()):
+            closure.add_class(class_name)
+            for attribute in class_infos.attributes():
+                if selected.intersection(attribute["attr_origin"]):
+                    closure.add_attribute(attribute)
+    for class_name in required_classes or []:
+        closure.add_class(class_name)
+    closure.resolve()
+
+    kept_classes: dict[str, "CIMComponentDefinition"] = {}
+    attribute_count = kept_attribute_count = 0
+    for class_name, class_infos in class_dict.items():
+        attribute_count += len(class_infos.attributes())
+        if class_name not in closure.classes:
+            continue
+        attributes = [attribute for attribute in class_infos.attributes() if id(attribute) in closure.attributes]
+        for attribute in attributes:
+            attribute["attr_origin"] = _select_origins(attribute["attr_origin"], selected)
+        class_infos.set_attributes(attributes)
+        if selected.intersection(class_infos.origins()):
+            class_infos.set_origins(_select_origins(class_infos.origins(), selected))
+        kept_classes[class_name] = class_infos
+        kept_attribute_count += len(attributes)
+    _select_dependency_origins(kept_classes, list(session.package_listed_by_short_name), selected)
+
+    dependencies = _select_session_profiles(kept_classes, session, selected)
+    if dependencies:
+        logger.warning(f"Profiles {', '.join(dependencies)} are kept as dependency of the selected profiles.")
+    logger.info(
+        f"Selected profiles {', '.join(profiles)}: {len(kept_classes)} of {len(class_dict)} classes"
+        + f" and {kept_attribute_count} of {attribute_count} attributes."
+    )
+    return kept_classes
+
+
+def select_root_classes(
+    class_dict: dict[str, "CIMComponentDefinition"],
+    session: "GenerationSession",
+    root_classes: list[str],
+    follow_associations: bool = False,
+    required_classes: list[str] | None = None,
+) -> tuple[dict[str, "CIMComponentDefinition"], dict]:
+    """Reduce the merged classes to the classes reachable from some root classes.
+
+    The reachable classes are the transitive closure of the root classes and the classes needed by the language
+    packages (required_classes) over the superclasses and the classes of the attributes. Datatypes, enums and
+    primitives used by attributes are always followed, associated classes only if follow_associations is set.
+    Attributes of associations to classes outside of the closure are removed. Subclasses are not followed.
+    The profiles and namespaces of the session are reduced to those used by the kept classes.
+
+    The classes are changed in place, the superclasses and subclasses have to be computed again afterwards.
+
+    :param class_dict:          Map of class name to merged class info.
+    :param session:             Session of the generation run.
+    :param root_classes:        Names of the root classes, e.g. ["ACLineSegment", "Terminal"].
+    :param follow_associations: Add the classes of associations to the closure.
+    :param required_classes:    Names of the classes needed by the language packages, e.g. the classes used by their
+                                static files.
+    :return:                    Map of class name to class info of the kept classes in the original order,
+                                and a report with the root classes, the kept and the pruned classes and attributes.
+    """
+    unknown = [class_name for class_name in root_classes if class_name not in class_dict]
+    if unknown:
+        raise SelectionError(f"Unknown root classes: {', '.join(unknown)}.")
+
+    closure: set[str] = set()
+    pending = list(root_classes) + (required_classes or [])
+    while pending:
+        class_name = pending.pop()
+        if class_name in closure or class_name not in class_dict:
+            continue
+        closure.add(class_name)
+        class_infos = class_dict[class_name]
+        pending.append(class_infos.subclass_of())
+        for attribute in class_infos.attributes():
+            attribute_class = _get_attribute_class(attribute)
+            if follow_associations or not _is_association(attribute_class, class_dict):
+                pending.append(attribute_class)
+
+    kept_classes: dict[str, "CIMComponentDefinition"] = {}
+    pruned_attributes: list[str] = []
+    for class_name, class_infos in class_dict.items():
+        if class_name not in closure:
+            continue
+        attributes = []
+        for attribute in class_infos.attributes():
+            if _get_attribute_class(attribute) in closure:
+                attributes.append(attribute)
+            else:
+                pruned_attributes.append(f"{class_name}.{attribute['label']}")
+        class_infos.set_attributes(attributes)
+        kept_classes[class_name] = class_infos
+
+    _select_session_profiles(kept_classes, session, set())
+    pruned_classes = [class_name for class_name in class_dict if class_name not in closure]
+    logger.info(
+        f"Root classes {', '.join(root_classes)}: {len(kept_classes)} of {len(class_dict)} classes kept,"
+        + f" {len(pruned_classes)} classes and {len(pruned_attributes)} association attributes pruned."
+    )
+    report = {
+        "root_classes": root_classes,
+        "follow_associations": follow_associations,
+        "required_classes": required_classes or [],
+        "class_count": len(class_dict),
+        "kept_class_count": len(kept_classes),
+        "pruned_class_count": len(pruned_classes),
+        "pruned_attribute_count": len(pruned_attributes),
+        "kept_classes": sorted(kept_classes),
+        "pruned_classes": sorted(pruned_classes),
+        "pruned_attributes": sorted(pruned_attributes),
+    }
+    return kept_classes, report
+
+
+def write_report(path: Path, report: dict) -> None:
+    """Write the report of select_root_classes as JSON file.
+
+    :param path:   Path of the report.
+    :param report: Report with the kept and the pruned classes and attributes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+    logger.info(f"Pruning report written to '{path}'.")
+
+
+class _DependencyClosure:
+    """Classes and attributes needed by the selected classes and attributes."""
+
+    def __init__(self, class_dict: dict[str, "CIMComponentDefinition"]):
+        self.class_dict = class_dict
+        self.classes: set[str] = set()
+        self.attributes: set[int] = set()  # ids of the attribute dicts
+        self._pending_classes: list[str] = []
+        self._pending_attributes: list[dict] = []
+
+    def add_class(self, class_name: str) -> None:
+        if class_name in self.class_dict and class_name not in self.classes:
+            self.classes.add(class_name)
+            self._pending_classes.append(class_name)
+
+    def add_attribute(self, attribute: dict) -> None:
+        if id(attribute) not in self.attributes:
+            self.attributes.add(id(attribute))
+            self._pending_attributes.append(attribute)
+
+    def resolve(self) -> None:
+        """Add the dependencies of the added classes and attributes until nothing is missing."""
+        while self._pending_classes or self._pending_attributes:
+            while self._pending_classes:
+                class_infos = self.class_dict[self._pending_classes.pop()]
+                self.add_class(class_infos.subclass_of())
+                if class_infos.is_a_datatype_class():
+                    for attribute in class_infos.attributes():
+                        self.add_attribute(attribute)
+            while self._pending_attributes:
+                attribute = self._pending_attributes.pop()
+                self.add_class(attribute["domain"])
+                self.add_class(_get_attribute_class(attribute))
+                if "inverse_role" in attribute:
+                    inverse_class, inverse_label = attribute["inverse_role"].split(".")
+                    self.add_class(inverse_class)
+                    if inverse_class in self.class_dict:
+                        inverse_attribute = self.class_dict[inverse_class].attribute(inverse_label)
+                        if inverse_attribute:
+                            self.add_attribute(inverse_attribute)
+
+
+def _get_attribute_class(attribute: dict) -> str:
+    # Imported here, because cimgen imports this module
+    from cimgen.cimgen import _get_attribute_class
+
+    return _get_attribute_class(attribute)
+
+
+def _is_association(class_name: str, class_dict: dict[str, "CIMComponentDefinition"]) -> bool:
+    if class_name not in class_dict:
+        return False
+    class_infos = class_dict[class_name]
+    return not (
+        class_infos.is_a_datatype_class() or class_infos.is_a_primitive_class() or class_infos.is_an_enum_class()
+    )
+
+
+def _select_origins(origins: list[str], selected: set[str]) -> list[str]:
+    # Keep the origins of classes and attributes which are only kept as dependency
+    return [origin for origin in origins if origin in selected] or origins
+
+
+def _select_dependency_origins(
+    class_dict: dict[str, "CIMComponentDefinition"], profile_order: list[str], selected: set[str]
+) -> None:
+    """Reduce the origins of the classes kept only as dependency to the profiles they are used in.
+
+    Abstract superclasses are defined in many profiles. If such a class is only kept as superclass of classes of the
+    selected profiles, its origins would otherwise bring all these profiles back into the profile enums.
+    The origins of a class without a selected origin are changed to the profiles of its kept attributes, its kept
+    subclasses and the kept attributes using it, or to the selected profiles if there are none.
+
+    :param class_dict:    Map of class name to class info of the kept classes.
+    :param profile_order: Short names of all profiles in the order of the session.
+    :param selected:      Short names of the selected profiles.
+    """
+    subclasses: dict[str, list[str]] = {}
+    using_profiles: dict[str, set[str]] = {}
+    for class_name, class_infos in class_dict.items():
+        subclasses.setdefault(class_infos.subclass_of(), []).append(class_name)
+        for attribute in class_infos.attributes():
+            using_profiles.setdefault(_get_attribute_class(attribute), set()).update(attribute["attr_origin"])
+
+    done: set[str] = set()
+
+    def select(class_name: str) -> list[str]:
+        class_infos = class_dict[class_name]
+        if class_name not in done:
+            done.add(class_name)
+            if not selected.intersection(class_infos.origins()):
+                used_profiles = set(using_profiles.get(class_name, ()))
+                for attribute in class_infos.attributes():
+                    used_profiles.update(attribute["attr_origin"])
+                for subclass in subclasses.get(class_name, []):
+                    used_profiles.update(select(subclass))
+                used_profiles = used_profiles or selected
+                class_infos.set_origins([profile for profile in profile_order if profile in used_profiles])
+        return class_infos.origins()
+
+    for class_name in class_dict:
+        select(class_name)
+
+
+def _select_session_profiles(
+    class_dict: dict[str, "CIMComponentDefinition"], session: "GenerationSession", selected: set[str]
+) -> list[str]:
+    """Reduce the profiles and namespaces of the session to the selected profiles and to those used by the classes.
+
+    The used namespaces are the namespaces of the classes, their attributes and their enum instances.
+
+    :param class_dict: Map of class name to class info of the kept classes.
+    :param session:    Session of the generation run.
+    :param selected:   Short names of the selected profiles.
+    :return:           Short names of the profiles which are kept only because they are used by the classes.
+    """
+    used_profiles = set(selected)
+    used_namespaces = set()
+    for class_infos in class_dict.values():
+        used_profiles.update(class_infos.origins())
+        used_namespaces.add(session.get_namespace(class_infos.namespace))
+        for attribute in class_infos.attributes():
+            used_profiles.update(attribute["attr_origin"])
+            used_namespaces.add(session.get_namespace(attribute["namespace"]))
+        for instance in class_infos.enum_instances():
+            used_namespaces.add(session.get_namespace(instance["namespace"]))
+    dependencies = [profile for profile in session.package_listed_by_short_name if profile not in selected]
+    dependencies = [profile for profile in dependencies if profile in used_profiles]
+    session.package_listed_by_short_name = {
+        profile: uris for profile, uris in session.package_listed_by_short_name.items() if profile in used_profiles
+    }
+    session.long_profile_names = {
+        profile: name for profile, name in session.long_profile_names.items() if profile in used_profiles
+    }
+    session.used_namespaces = [namespace for namespace in session.used_namespaces if namespace in used_namespaces]
+    return dependencies
@@ -0,0 +1,180 @@
+from collections.abc import Callable, Iterator, Sequence
+from functools import cache
+
+
+class UnsupportedTemplateError(Exception):
+    """The template or its data uses a mustache feature not supported by the compiled templates."""
+
+
+def compile_template(tokens: list[tuple[str, str]], name: str = "template") -> Callable[[dict], str]:
+    """Compile the tokens of a mustache template into a python render function.
+
+    The generated function renders exactly the same text as chevron.render for the same tokens and data.
+    It looks up the keys in the same order of scopes as chevron, but the structure of the template is resolved when
+    compiling, the tags are not interpreted again for every render and every item of a list.
+    Partials are not supported (UnsupportedTemplateError is raised when compiling). Lambdas in the data are not
+    supported either (UnsupportedTemplateError is raised when rendering).
+
+    :param tokens: Tokens of the template created by chevron.tokenizer.tokenize.
+    :param name:   Name of the template used in tracebacks.
+    :return:       Render function, which gets the data and returns the rendered text.
+    """
+    lines = ["def render(data):", "    stack = [data]", "    output = []", "    write = output.append"]
+    _Compiler(lines).compile_tokens(iter(tokens), 1, [])
+    lines.append("    return ''.join(output)")
+    namespace = {
+        "get_key": _get_key,
+        "to_text": _to_text,
+        "html_escape": _html_escape,
+        "is_list": _is_list,
+        "UnsupportedTemplateError": UnsupportedTemplateError,
+    }
+    exec(compile("\n".join(lines), f"<compiled template {name}>", "exec"), namespace)
+    return namespace["render"]
+
+
+class _Compiler:
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+        self.counter = 0
+
+    def compile_tokens(self, tokens: Iterator[tuple[str, str]], level: int, open_sections: list[str]) -> None:
+        indent = "    " * level
+        for tag, key in tokens:
+            if tag == "end":
+                return
+            if tag == "literal":
+                self.lines.append(f"{indent}write({key!r})")
+            elif tag == "variable":
+                self.lines.append(f"{indent}write(html_escape(to_text({self._variable(key)})))")
+            elif tag == "no escape":
+                self.lines.append(f"{indent}write(to_text({self._get_key(key)}))")
+            elif tag in ("section", "inverted section"):
+                if key in open_sections:
+                    # chevron does not track nested sections with the same key reliably
+                    raise UnsupportedTemplateError(f"Nested sections with the same key '{key}'")
+                self._compile_section(tag, key, tokens, level, open_sections + [key])
+            elif tag == "partial":
+                raise UnsupportedTemplateError(f"Partial '{key}'")
+            # set delimiter tags are handled by the tokenizer already
+
+    def _compile_section(
+        self, tag: str, key: str, tokens: Iterator[tuple[str, str]], level: int, open_sections: list[str]
+    ) -> None:
+        # A section is rendered like chevron renders it: the scope is pushed to the stack (for lists every item), and
+        # the content is skipped if the scope is falsy.
+        indent = "    " * level
+        self.counter += 1
+        value = f"value{self.counter}"
+        item = f"item{self.counter}"
+        self.lines.append(f"{indent}{value} = {self._get_key(key)}")
+        if tag == "inverted section":
+            self.lines.append(f"{indent}if not {value}:")
+            self.lines.append(f"{indent}    stack.append(True)")
+            self.compile_tokens(tokens, level + 1, open_sections)
+            self.lines.append(f"{indent}    stack.pop()")
+            return
+        self.lines.append(f"{indent}if callable({value}):")
+        self.lines.append(f"{indent}    raise UnsupportedTemplateError({'Lambda in section ' + key!r})")
+        self.lines.append(f"{indent}if is_list({value}):")
+        self.lines.append(f"{indent}    for {item} in {value}:")
+        self.lines.append(f"{indent}        if {item}:")
+        self.lines.append(f"{indent}            stack.append({item})")
+        start = len(self.lines)
+        self.compile_tokens(tokens, level + 3, open_sections)
+        body = self.lines[start:]
+        self.lines.append(f"{indent}            stack.pop()")
+        self.lines.append(f"{indent}elif {value}:")
+        self.lines.append(f"{indent}    stack.append({value})")
+        self.lines.extend(line[8:] for line in body)
+        self.lines.append(f"{indent}    stack.pop()")
+
+    @staticmethod
+    def _get_key(key: str) -> str:
+        if key == ".":
+            return "stack[-1]"
+        return f"get_key(stack, {key!r}, {tuple(key.split('.'))!r})"
+
+    @staticmethod
+    def _variable(key: str) -> str:
+        if key == ".":
+            # chevron takes the scope below if the current scope has been coerced to True by an inverted section
+            return "(stack[-2] if stack[-1] is True else stack[-1])"
+        return _Compiler._get_key(key)
+
+
+# Scopes of these types never contain keys. chevron tries to find a key with subscription, getattr and as list index,
+# which fails with an exception unless the key is an attribute of the type or a number.
+_PLAIN_TYPES = (str, bool, int, float, type(None))
+
+
+def _get_key(stack: list, key: str, children: tuple[str, ...]) -> object:
+    # Same lookup as chevron.renderer._get_key, but the stack is ordered from the outer to the inner scope.
+    simple_key = len(children) == 1 and not _is_number(key)
+    for scope in reversed(stack):
+        try:
+            if simple_key:
+                # Fast paths for the most common cases without exceptions for missing keys
+                scope_type = type(scope)
+                if scope_type is dict:
+                    if key not in scope:
+                        continue
+                    value = scope[key]
+                    return value if type(value) is str else _falsy_to_empty(value)
+                if scope_type in _PLAIN_TYPES and not hasattr(scope_type, key):
+                    continue
+            for child in children:
+                try:
+                    scope = scope[child]
+                except (TypeError, AttributeError):
+                    try:
+                        scope = getattr(scope, child)
+                    except (TypeError, AttributeError):
+                        scope = scope[int(child)]
+            return _falsy_to_empty(scope)
+        except (_KeyNotFoundError, AttributeError, KeyError, IndexError, ValueError):
+            pass
+    return ""
+
+
+class _KeyNotFoundError(Exception):
+    # chevron continues with the next scope for falsy values of custom types with _CHEVRON_return_scope_when_falsy.
+    pass
+
+
+def _falsy_to_empty(scope: object) -> object:
+    # Return an empty string if falsy, but 0 and False are returned as they are.
+    if scope in (0, False):
+        return scope
+    try:
+        if scope._CHEVRON_return_scope_when_falsy:
+            return scope
+    except AttributeError:
+        return scope or ""
+    raise _KeyNotFoundError()
+
+
+@cache
+def _is_number(key: str) -> bool:
+    try:
+        int(key)
+        return True
+    except ValueError:
+        return False
+
+
+def _to_text(value: object) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def _html_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace('"', "&quot;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _is_list(value: object) -> bool:
+    value_type = type(value)
+    if value_type is list:
+        return True
+    if value_type is dict or value_type in _PLAIN_TYPES:
+        return False
+    return isinstance(value, (Sequence, Iterator)) and not isinstance(value, str)